@@ -1,7 +1,10 @@
 """Export plugins for different data formats."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Target size of the blocks handed to the WSGI server when streaming
+BLOCK_SIZE = 64 * 1024
 
 
 class BaseExporter(ABC):
@@ -35,6 +38,43 @@ class BaseExporter(ABC):
         """Export hosts data to format-specific bytes."""
         pass
 
+    def iter_networks(self, networks: Iterable[Any]) -> Iterator[bytes]:
+        """Export networks as an iterator of byte chunks for streaming.
+
+        The default renders the whole export eagerly, so errors surface
+        before a response is started; formats that can be written
+        incrementally override this.
+        """
+        return iter((self.export_networks(list(networks)),))
+
+    def iter_hosts(self, hosts: Iterable[Any]) -> Iterator[bytes]:
+        """Export hosts as an iterator of byte chunks for streaming."""
+        return iter((self.export_hosts(list(hosts)),))
+
+
+def iter_blocks(
+    chunks: Iterable[bytes], block_size: int = BLOCK_SIZE
+) -> Iterator[bytes]:
+    """Coalesce small exporter chunks into blocks of about block_size.
+
+    Exporters may yield one chunk per record; writing each of those to
+    the socket (and through the gzip stream) separately costs far more
+    than the formatting itself.
+    """
+    # Joining the pending chunks sizes each block exactly once, where a
+    # growing bytearray would reallocate and then be copied out again
+    pending = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= block_size:
+            yield b"".join(pending)
+            pending.clear()
+            size = 0
+    if size:
+        yield b"".join(pending)
+
 
 # Registry for available exporters
 _exporters: Dict[str, BaseExporter] = {}
@@ -2,10 +2,38 @@
 
 import csv
 import io
-from typing import Any, List
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
 
 from . import BaseExporter
 
+# Rows buffered before a chunk is handed to the response stream
+CHUNK_ROWS = 500
+
+NETWORK_HEADER = [
+    "Network",
+    "CIDR",
+    "Broadcast Address",
+    "VLAN ID",
+    "Location",
+    "Description",
+    "Total Hosts",
+    "Used Hosts",
+    "Available Hosts",
+]
+
+HOST_HEADER = [
+    "IP Address",
+    "Hostname",
+    "MAC Address",
+    "Status",
+    "Is Assigned",
+    "Last Seen",
+    "Discovery Source",
+    "Network",
+    "Description",
+]
+
 
 class CSVExporter(BaseExporter):
     """CSV format exporter."""
@@ -24,82 +52,74 @@ class CSVExporter(BaseExporter):
 
     def export_networks(self, networks: List[Any]) -> bytes:
         """Export networks to CSV format."""
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # CSV Header
-        writer.writerow(
-            [
-                "Network",
-                "CIDR",
-                "Broadcast Address",
-                "VLAN ID",
-                "Location",
-                "Description",
-                "Total Hosts",
-                "Used Hosts",
-                "Available Hosts",
-            ]
-        )
-
-        # Data rows
-        for network in networks:
-            writer.writerow(
-                [
-                    network.network,
-                    network.cidr,
-                    network.broadcast_address or "",
-                    network.vlan_id or "",
-                    network.location or "",
-                    network.description or "",
-                    network.total_hosts,
-                    network.used_hosts,
-                    network.available_hosts,
-                ]
-            )
-
-        return output.getvalue().encode("utf-8")
+        return b"".join(self.iter_networks(networks))
 
     def export_hosts(self, hosts: List[Any]) -> bytes:
         """Export hosts to CSV format."""
+        return b"".join(self.iter_hosts(hosts))
+
+    def iter_networks(self, networks: Iterable[Any]) -> Iterator[bytes]:
+        """Export networks to CSV in chunks of rows."""
+        return self._iter_rows(NETWORK_HEADER, map(_network_row, networks))
+
+    def iter_hosts(self, hosts: Iterable[Any]) -> Iterator[bytes]:
+        """Export hosts to CSV in chunks of rows."""
+        return self._iter_rows(HOST_HEADER, map(_host_row, hosts))
+
+    @staticmethod
+    def _iter_rows(header, rows):
         output = io.StringIO()
         writer = csv.writer(output)
-
-        # CSV Header
-        writer.writerow(
-            [
-                "IP Address",
-                "Hostname",
-                "MAC Address",
-                "Status",
-                "Is Assigned",
-                "Last Seen",
-                "Discovery Source",
-                "Network",
-                "Description",
-            ]
-        )
-
-        # Data rows
-        for host in hosts:
-            network_info = ""
-            if host.network_ref:
-                network_info = (
-                    f"{host.network_ref.network}/{host.network_ref.cidr}"
-                )
-
-            writer.writerow(
-                [
-                    host.ip_address,
-                    host.hostname or "",
-                    host.mac_address or "",
-                    host.status,
-                    host.is_assigned,
-                    host.last_seen.isoformat() if host.last_seen else "",
-                    host.discovery_source or "",
-                    network_info,
-                    host.description or "",
-                ]
-            )
-
-        return output.getvalue().encode("utf-8")
+        writer.writerow(header)
+
+        # writerows() formats a whole chunk in one C-level call. Free-text
+        # columns may hold commas, quotes or newlines, so quoting is left
+        # to the csv module rather than a hand-rolled ",".join().
+        rows = iter(rows)
+        while chunk := list(islice(rows, CHUNK_ROWS)):
+            writer.writerows(chunk)
+            yield _drain(output)
+
+        if output.tell():
+            yield _drain(output)
+
+
+def _drain(output):
+    """Return the buffered CSV text as bytes and reset the buffer."""
+    chunk = output.getvalue().encode("utf-8")
+    output.seek(0)
+    output.truncate(0)
+    return chunk
+
+
+def _network_row(network):
+    total_hosts = network.total_hosts
+    used_hosts = network.used_hosts
+    return (
+        network.network,
+        network.cidr,
+        network.broadcast_address or "",
+        network.vlan_id or "",
+        network.location or "",
+        network.description or "",
+        total_hosts,
+        used_hosts,
+        total_hosts - used_hosts,
+    )
+
+
+def _host_row(host):
+    network = host.network_ref
+    network_info = f"{network.network}/{network.cidr}" if network else ""
+
+    return (
+        host.ip_address,
+        host.hostname or "",
+        host.mac_address or "",
+        host.status,
+        host.is_assigned,
+        host.last_seen.isoformat() if host.last_seen else "",
+        host.discovery_source or "",
+        network_info,
+        host.description or "",
+    )
@@ -1,10 +1,35 @@
 """DNSmasq export functionality."""
 
-from typing import Any, List
+from typing import Any, Iterable, Iterator, List, Optional
 from urllib.parse import parse_qs, urlparse
 
 from . import BaseExporter
 
+# Fixed banner lines for each mode, built once rather than per export
+_HEADERS = {
+    "dns": (
+        "# DNSmasq host configuration - DNS mode",
+        "# Generated by Python IPAM",
+        "# DNS-only mode: host-record=hostname,IP",
+        "# Use this for DNSmasq as DNS server only",
+        "",
+    ),
+    "dhcp": (
+        "# DNSmasq host configuration - DHCP mode",
+        "# Generated by Python IPAM",
+        "# DHCP-only mode: dhcp-host=MAC,IP,hostname",
+        "# Use this for DNSmasq as DHCP server only",
+        "",
+    ),
+    "combined": (
+        "# DNSmasq host configuration - COMBINED mode",
+        "# Generated by Python IPAM",
+        "# Combined mode: dhcp-host=MAC,IP,hostname + host-record=hostname,IP",
+        "# Use this for DNSmasq as both DNS and DHCP server",
+        "",
+    ),
+}
+
 
 class DNSmasqExporter(BaseExporter):
     """DNSmasq format exporter for hosts with configurable modes."""
@@ -15,7 +40,7 @@ class DNSmasqExporter(BaseExporter):
         Args:
             mode: Export mode - 'dns', 'dhcp', or 'combined' (default)
         """
-        if mode not in ["dns", "dhcp", "combined"]:
+        if mode not in _HEADERS:
             raise ValueError(
                 f"Invalid mode '{mode}'. Must be 'dns', 'dhcp', or 'combined'"
             )
@@ -47,153 +72,91 @@ class DNSmasqExporter(BaseExporter):
         - 'dhcp': Only dhcp-host entries for DHCP reservations
         - 'combined': Both DNS and DHCP entries (default)
         """
-        lines = [
-            f"# DNSmasq host configuration - {self.mode.upper()} mode",
-            "# Generated by Python IPAM",
-        ]
-
-        # Add format explanation based on mode
-        if self.mode == "dns":
-            lines.extend(
-                [
-                    "# DNS-only mode: host-record=hostname,IP",
-                    "# Use this for DNSmasq as DNS server only",
-                    "",
-                ]
-            )
-        elif self.mode == "dhcp":
-            lines.extend(
-                [
-                    "# DHCP-only mode: dhcp-host=MAC,IP,hostname",
-                    "# Use this for DNSmasq as DHCP server only",
-                    "",
-                ]
-            )
-        else:  # combined
-            lines.extend(
-                [
-                    "# Combined mode: dhcp-host=MAC,IP,hostname + host-record=hostname,IP",
-                    "# Use this for DNSmasq as both DNS and DHCP server",
-                    "",
-                ]
-            )
-
-        active_hosts = [h for h in hosts if h.status == "active" and h.hostname]
-        reserved_hosts = [
-            h for h in hosts if h.status == "reserved" and h.hostname
-        ]
+        lines = list(_HEADERS[self.mode])
+
+        # One pass over the hosts classifies entries and counts statistics
+        sections = {"active": [], "reserved": []}
+        cnames = []
+        # Statuses with eligible hosts, even if the mode skips their entry
+        seen = set()
+        dhcp_entries = dns_entries = hosts_with_entries = 0
+        for host in hosts:
+            hostname = host.hostname
+            section = sections.get(host.status)
+            if section is None or not hostname:
+                continue
+
+            entry = self._host_entry(host)
+            if entry is not None:
+                section.append(entry)
+                if entry.startswith("dhcp-host="):
+                    dhcp_entries += 1
+                else:
+                    dns_entries += 1
+            if host.cname:
+                cnames.append(f"cname={host.cname},{hostname}")
+            seen.add(host.status)
+            hosts_with_entries += 1
 
         # Process active hosts
-        if active_hosts:
+        if "active" in seen:
             lines.append("# Active hosts")
-            for host in active_hosts:
-                entries = self._generate_host_entries(host)
-                lines.extend(entries)
+            lines.extend(sections["active"])
             lines.append("")
 
         # Process reserved hosts
-        if reserved_hosts:
+        if "reserved" in seen:
             lines.append("# Reserved hosts")
-            for host in reserved_hosts:
-                entries = self._generate_host_entries(host)
-                lines.extend(entries)
+            lines.extend(sections["reserved"])
             lines.append("")
 
         # Add CNAME entries for all modes
-        cname_hosts = [
-            h
-            for h in hosts
-            if h.cname and h.hostname and h.status in ["active", "reserved"]
-        ]
-        if cname_hosts:
+        if cnames:
             lines.append("# CNAME aliases")
-            for host in cname_hosts:
-                lines.append(f"cname={host.cname},{host.hostname}")
+            lines.extend(cnames)
             lines.append("")
 
         # Add statistics
-        stats = self._calculate_statistics(hosts)
         lines.extend(
             [
                 "# Statistics:",
-                f"# Total exported entries: {stats['total']}",
-                f"# Hosts with entries: {stats['hosts_with_entries']}",
+                f"# Total exported entries: {dhcp_entries + dns_entries}",
+                f"# Hosts with entries: {hosts_with_entries}",
             ]
         )
 
         if self.mode in ["dhcp", "combined"]:
-            lines.append(f"# DHCP reservations: {stats['dhcp_entries']}")
+            lines.append(f"# DHCP reservations: {dhcp_entries}")
         if self.mode in ["dns", "combined"]:
-            lines.append(f"# DNS records: {stats['dns_entries']}")
+            lines.append(f"# DNS records: {dns_entries}")
 
         # Always show CNAME statistics if any exist
-        if stats["cname_entries"] > 0:
-            lines.append(f"# CNAME aliases: {stats['cname_entries']}")
+        if cnames:
+            lines.append(f"# CNAME aliases: {len(cnames)}")
 
         return "\n".join(lines).encode("utf-8")
 
-    def _generate_host_entries(self, host) -> List[str]:
-        """Generate DNSmasq entries for a single host based on mode."""
-        entries = []
+    def iter_hosts(self, hosts: Iterable[Any]) -> Iterator[bytes]:
+        """Export hosts eagerly without first collecting them in a list.
+
+        export_hosts() makes a single pass, so a yield_per query can be
+        consumed batch by batch instead of loading every host at once.
+        """
+        return iter((self.export_hosts(hosts),))
 
+    def _host_entry(self, host) -> Optional[str]:
+        """Return the DNSmasq entry for a single host based on mode."""
         if self.mode == "dns":
             # DNS-only mode: only host-record entries
-            entries.append(f"host-record={host.hostname},{host.ip_address}")
-
-        elif self.mode == "dhcp":
-            # DHCP-only mode: only dhcp-host entries (requires MAC address)
-            if host.mac_address:
-                entries.append(
-                    f"dhcp-host={host.mac_address},{host.ip_address},{host.hostname}"
-                )
-            # Skip hosts without MAC address in DHCP-only mode
+            return f"host-record={host.hostname},{host.ip_address}"
 
-        else:  # combined mode
-            if host.mac_address:
-                # DHCP reservation (includes DNS resolution)
-                entries.append(
-                    f"dhcp-host={host.mac_address},{host.ip_address},{host.hostname}"
-                )
-            else:
-                # DNS-only record for hosts without MAC
-                entries.append(f"host-record={host.hostname},{host.ip_address}")
-
-        return entries
-
-    def _calculate_statistics(self, hosts) -> dict:
-        """Calculate export statistics."""
-        hosts_with_hostname = [
-            h
-            for h in hosts
-            if h.hostname and h.status in ["active", "reserved"]
-        ]
-
-        total_entries = 0
-        dhcp_entries = 0
-        dns_entries = 0
-
-        for host in hosts_with_hostname:
-            if self.mode == "dns":
-                total_entries += 1
-                dns_entries += 1
-            elif self.mode == "dhcp":
-                if host.mac_address:
-                    total_entries += 1
-                    dhcp_entries += 1
-            else:  # combined
-                total_entries += 1
-                if host.mac_address:
-                    dhcp_entries += 1
-                else:
-                    dns_entries += 1
+        if host.mac_address:
+            # DHCP reservation (includes DNS resolution)
+            return f"dhcp-host={host.mac_address},{host.ip_address},{host.hostname}"
 
-        # Count CNAME entries
-        cname_entries = len([h for h in hosts_with_hostname if h.cname])
+        if self.mode == "dhcp":
+            # Skip hosts without MAC address in DHCP-only mode
+            return None
 
-        return {
-            "total": total_entries,
-            "hosts_with_entries": len(hosts_with_hostname),
-            "dhcp_entries": dhcp_entries,
-            "dns_entries": dns_entries,
-            "cname_entries": cname_entries,
-        }
+        # Combined mode: DNS-only record for hosts without MAC
+        return f"host-record={host.hostname},{host.ip_address}"
@@ -1,7 +1,9 @@
 """JSON export functionality."""
 
-import json
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List
+
+import orjson
 
 from . import BaseExporter
 
@@ -23,54 +25,97 @@ class JSONExporter(BaseExporter):
 
     def export_networks(self, networks: List[Any]) -> bytes:
         """Export networks to JSON format."""
-        data = {"export_type": "networks", "export_version": "1.0", "data": []}
-
-        for network in networks:
-            data["data"].append(
-                {
-                    "network": network.network,
-                    "cidr": network.cidr,
-                    "broadcast_address": network.broadcast_address,
-                    "vlan_id": network.vlan_id,
-                    "location": network.location,
-                    "description": network.description,
-                    "statistics": {
-                        "total_hosts": network.total_hosts,
-                        "used_hosts": network.used_hosts,
-                        "available_hosts": network.available_hosts,
-                    },
-                }
-            )
-
-        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        return b"".join(self.iter_networks(networks))
 
     def export_hosts(self, hosts: List[Any]) -> bytes:
         """Export hosts to JSON format."""
-        data = {"export_type": "hosts", "export_version": "1.0", "data": []}
-
-        for host in hosts:
-            network_info = None
-            if host.network_ref:
-                network_info = {
-                    "network": host.network_ref.network,
-                    "cidr": host.network_ref.cidr,
-                    "vlan_id": host.network_ref.vlan_id,
-                }
-
-            data["data"].append(
-                {
-                    "ip_address": host.ip_address,
-                    "hostname": host.hostname,
-                    "mac_address": host.mac_address,
-                    "status": host.status,
-                    "is_assigned": host.is_assigned,
-                    "last_seen": (
-                        host.last_seen.isoformat() if host.last_seen else None
-                    ),
-                    "discovery_source": host.discovery_source,
-                    "description": host.description,
-                    "network": network_info,
-                }
-            )
-
-        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        return b"".join(self.iter_hosts(hosts))
+
+    def iter_networks(self, networks: Iterable[Any]) -> Iterator[bytes]:
+        """Export networks to JSON, one record per chunk."""
+        return _iter_document("networks", map(_network_record, networks))
+
+    def iter_hosts(self, hosts: Iterable[Any]) -> Iterator[bytes]:
+        """Export hosts to JSON, one record per chunk."""
+        return _iter_document("hosts", map(_host_record, hosts))
+
+
+def _iter_document(export_type, records):
+    """Yield an indented export document record by record.
+
+    The output is byte-for-byte what ``json.dumps(document, indent=2,
+    ensure_ascii=False)`` would produce for the complete document.
+    """
+    head, prefix, suffix = _document_frame(export_type)
+
+    started = False
+    for record in records:
+        # Encoded strings never contain raw newlines, so this only
+        # shifts the record's own lines under the "data" list
+        item = b"    " + orjson.dumps(
+            record, option=orjson.OPT_INDENT_2
+        ).replace(b"\n", b"\n    ")
+        if started:
+            yield b",\n" + item
+        else:
+            yield prefix + b"[\n" + item
+            started = True
+
+    if started:
+        yield b"\n  ]" + suffix
+    else:
+        yield head
+
+
+@lru_cache(maxsize=None)
+def _document_frame(export_type):
+    """Return the empty document and its halves around the "data" list."""
+    head = orjson.dumps(
+        {"export_type": export_type, "export_version": "1.0", "data": []},
+        option=orjson.OPT_INDENT_2,
+    )
+    # Split around the empty list so records can be written in between
+    prefix, suffix = head.rsplit(b"[]", 1)
+    return head, prefix, suffix
+
+
+def _network_record(network):
+    # Read each statistic once and derive available_hosts from them
+    total_hosts = network.total_hosts
+    used_hosts = network.used_hosts
+    return {
+        "network": network.network,
+        "cidr": network.cidr,
+        "broadcast_address": network.broadcast_address,
+        "vlan_id": network.vlan_id,
+        "location": network.location,
+        "description": network.description,
+        "statistics": {
+            "total_hosts": total_hosts,
+            "used_hosts": used_hosts,
+            "available_hosts": total_hosts - used_hosts,
+        },
+    }
+
+
+def _host_record(host):
+    network = host.network_ref
+    network_info = None
+    if network:
+        network_info = {
+            "network": network.network,
+            "cidr": network.cidr,
+            "vlan_id": network.vlan_id,
+        }
+
+    return {
+        "ip_address": host.ip_address,
+        "hostname": host.hostname,
+        "mac_address": host.mac_address,
+        "status": host.status,
+        "is_assigned": host.is_assigned,
+        "last_seen": host.last_seen.isoformat() if host.last_seen else None,
+        "discovery_source": host.discovery_source,
+        "description": host.description,
+        "network": network_info,
+    }
@@ -1,11 +1,22 @@
 """Import plugins for different data formats."""
 
+import ipaddress
+import socket
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
+
+# Checked once per imported row, so kept as module-level sets
+VALID_STATUSES = frozenset({"active", "inactive", "reserved"})
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSE_VALUES = frozenset({"0", "false", "no", "off"})
 
 
 class BaseImporter(ABC):
-    """Abstract base class for data importers."""
+    """Abstract base class for data importers.
+
+    Records are plain dicts: validate_*_data() normalises them in place
+    and returns the same objects, so a record is allocated once per row.
+    """
 
     @property
     @abstractmethod
@@ -20,13 +31,23 @@ class BaseImporter(ABC):
         pass
 
     @abstractmethod
-    def import_networks(self, file_content: bytes) -> List[Dict[str, Any]]:
-        """Import networks from file content. Returns list of network data dicts."""
+    def import_networks(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
+        """Import networks from file content. Returns list of network data dicts.
+
+        file_content is either the raw bytes or a binary file object.
+        """
         pass
 
     @abstractmethod
-    def import_hosts(self, file_content: bytes) -> List[Dict[str, Any]]:
-        """Import hosts from file content. Returns list of host data dicts."""
+    def import_hosts(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
+        """Import hosts from file content. Returns list of host data dicts.
+
+        file_content is either the raw bytes or a binary file object.
+        """
         pass
 
     @abstractmethod
@@ -44,6 +65,36 @@ class BaseImporter(ABC):
         pass
 
 
+def validate_ipv4(address: str) -> None:
+    """Raise AddressValueError unless address is a dotted-quad IPv4 address.
+
+    Well-formed addresses are checked with inet_pton in C; only rejected
+    ones go through ipaddress, for its descriptive error message.
+    """
+    try:
+        socket.inet_pton(socket.AF_INET, address)
+    except (OSError, TypeError, ValueError):
+        ipaddress.IPv4Address(address)
+
+
+def broadcast_address(network: str, cidr: int) -> str:
+    """Return the broadcast address of network/cidr in dotted-quad form.
+
+    Raises the same errors as ipaddress.IPv4Network for invalid input,
+    which is only constructed when the fast inet_pton path rejects it.
+    """
+    try:
+        packed = socket.inet_pton(socket.AF_INET, network)
+    except (OSError, TypeError, ValueError):
+        packed = None
+    if packed is None or not 0 <= cidr <= 32:
+        network_obj = ipaddress.IPv4Network(f"{network}/{cidr}", strict=False)
+        return str(network_obj.broadcast_address)
+
+    last = int.from_bytes(packed, "big") | ((1 << (32 - cidr)) - 1)
+    return socket.inet_ntoa(last.to_bytes(4, "big"))
+
+
 # Registry for available importers
 _importers: Dict[str, BaseImporter] = {}
 
@@ -4,9 +4,36 @@ import csv
 import io
 import ipaddress
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
-
-from . import BaseImporter
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
+
+from . import (
+    FALSE_VALUES,
+    TRUE_VALUES,
+    VALID_STATUSES,
+    BaseImporter,
+    broadcast_address,
+    validate_ipv4,
+)
+
+# Record key -> (CSV header, value used when the column is missing)
+NETWORK_COLUMNS = {
+    "network": ("Network", ""),
+    "cidr": ("CIDR", ""),
+    "vlan_id": ("VLAN ID", ""),
+    "location": ("Location", ""),
+    "description": ("Description", ""),
+}
+
+HOST_COLUMNS = {
+    "ip_address": ("IP Address", ""),
+    "hostname": ("Hostname", ""),
+    "mac_address": ("MAC Address", ""),
+    "status": ("Status", "active"),
+    "is_assigned": ("Is Assigned", ""),
+    "last_seen": ("Last Seen", ""),
+    "discovery_source": ("Discovery Source", ""),
+    "description": ("Description", ""),
+}
 
 
 class CSVImporter(BaseImporter):
@@ -20,46 +47,17 @@ class CSVImporter(BaseImporter):
     def file_extensions(self) -> List[str]:
         return ["csv"]
 
-    def import_networks(self, file_content: bytes) -> List[Dict[str, Any]]:
+    def import_networks(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
         """Import networks from CSV content."""
-        csv_content = file_content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-
-        networks = []
-        for row in csv_reader:
-            networks.append(
-                {
-                    "network": row.get("Network", "").strip(),
-                    "cidr": row.get("CIDR", "").strip(),
-                    "vlan_id": row.get("VLAN ID", "").strip(),
-                    "location": row.get("Location", "").strip(),
-                    "description": row.get("Description", "").strip(),
-                }
-            )
-
-        return networks
-
-    def import_hosts(self, file_content: bytes) -> List[Dict[str, Any]]:
+        return _read_records(file_content, NETWORK_COLUMNS)
+
+    def import_hosts(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
         """Import hosts from CSV content."""
-        csv_content = file_content.decode("utf-8")
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-
-        hosts = []
-        for row in csv_reader:
-            hosts.append(
-                {
-                    "ip_address": row.get("IP Address", "").strip(),
-                    "hostname": row.get("Hostname", "").strip(),
-                    "mac_address": row.get("MAC Address", "").strip(),
-                    "status": row.get("Status", "active").strip(),
-                    "is_assigned": row.get("Is Assigned", "").strip(),
-                    "last_seen": row.get("Last Seen", "").strip(),
-                    "discovery_source": row.get("Discovery Source", "").strip(),
-                    "description": row.get("Description", "").strip(),
-                }
-            )
-
-        return hosts
+        return _read_records(file_content, HOST_COLUMNS)
 
     def validate_networks_data(
         self, data: List[Dict[str, Any]]
@@ -81,15 +79,11 @@ class CSVImporter(BaseImporter):
             try:
                 # Validate network format
                 cidr = int(network_data["cidr"])
-                network_obj = ipaddress.IPv4Network(
-                    f"{network_data['network']}/{cidr}", strict=False
-                )
+                broadcast = broadcast_address(network_data["network"], cidr)
 
                 # Add computed fields
                 network_data["cidr"] = cidr
-                network_data["broadcast_address"] = str(
-                    network_obj.broadcast_address
-                )
+                network_data["broadcast_address"] = broadcast
 
                 # Validate VLAN ID if provided
                 if network_data.get("vlan_id"):
@@ -126,19 +120,18 @@ class CSVImporter(BaseImporter):
 
             try:
                 # Validate IP address format
-                ipaddress.IPv4Address(host_data["ip_address"])
+                validate_ipv4(host_data["ip_address"])
 
                 # Validate status
-                valid_statuses = ["active", "inactive", "reserved"]
-                if host_data.get("status") not in valid_statuses:
+                if host_data.get("status") not in VALID_STATUSES:
                     host_data["status"] = "active"
 
                 # Validate and normalize is_assigned
                 if host_data.get("is_assigned"):
                     value = host_data["is_assigned"].strip().lower()
-                    if value in ["1", "true", "yes", "on"]:
+                    if value in TRUE_VALUES:
                         host_data["is_assigned"] = True
-                    elif value in ["0", "false", "no", "off"]:
+                    elif value in FALSE_VALUES:
                         host_data["is_assigned"] = False
                     else:
                         errors.append(
@@ -174,3 +167,45 @@ class CSVImporter(BaseImporter):
                 errors.append(f"Row {row_num}: Invalid IP address - {str(e)}")
 
         return valid_data, errors
+
+
+def _read_records(file_content, columns):
+    """Parse CSV content into records keyed as in columns.
+
+    Header positions are resolved once, so rows are read as plain lists
+    instead of building a dict of every column per row like DictReader.
+    """
+    if isinstance(file_content, (bytes, bytearray)):
+        file_content = io.BytesIO(file_content)
+    # Decoded incrementally instead of materialising the whole text first
+    stream = io.TextIOWrapper(file_content, encoding="utf-8", newline="")
+    try:
+        return _parse_records(csv.reader(stream), columns)
+    finally:
+        # Leave the caller's file open when the wrapper is discarded
+        stream.detach()
+
+
+def _parse_records(reader, columns):
+    header = next(reader, [])
+    # Like DictReader, a repeated header name resolves to its last column
+    positions = {name: i for i, name in enumerate(header)}
+    fields = [
+        (key, positions.get(name), default)
+        for key, (name, default) in columns.items()
+    ]
+
+    records = []
+    for row in reader:
+        if not row:
+            continue
+        width = len(row)
+        records.append(
+            {
+                key: (
+                    row[i] if i is not None and i < width else default
+                ).strip()
+                for key, i, default in fields
+            }
+        )
+    return records
@@ -1,11 +1,27 @@
 """JSON import functionality."""
 
-import json
 import ipaddress
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
 
-from . import BaseImporter
+import orjson
+
+from . import (
+    FALSE_VALUES,
+    TRUE_VALUES,
+    VALID_STATUSES,
+    BaseImporter,
+    broadcast_address,
+    validate_ipv4,
+)
+
+
+def _load(file_content):
+    """Parse JSON from bytes or a binary file object."""
+    # orjson only parses complete buffers, so a file is read in full
+    if not isinstance(file_content, (bytes, bytearray)):
+        file_content = file_content.read()
+    return orjson.loads(file_content)
 
 
 class JSONImporter(BaseImporter):
@@ -19,10 +35,11 @@ class JSONImporter(BaseImporter):
     def file_extensions(self) -> List[str]:
         return ["json"]
 
-    def import_networks(self, file_content: bytes) -> List[Dict[str, Any]]:
+    def import_networks(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
         """Import networks from JSON content."""
-        json_content = file_content.decode("utf-8")
-        data = json.loads(json_content)
+        data = _load(file_content)
 
         # Handle both direct array and our export format
         if isinstance(data, dict) and "data" in data:
@@ -48,10 +65,11 @@ class JSONImporter(BaseImporter):
 
         return networks
 
-    def import_hosts(self, file_content: bytes) -> List[Dict[str, Any]]:
+    def import_hosts(
+        self, file_content: Union[bytes, BinaryIO]
+    ) -> List[Dict[str, Any]]:
         """Import hosts from JSON content."""
-        json_content = file_content.decode("utf-8")
-        data = json.loads(json_content)
+        data = _load(file_content)
 
         # Handle both direct array and our export format
         if isinstance(data, dict) and "data" in data:
@@ -105,15 +123,11 @@ class JSONImporter(BaseImporter):
             try:
                 # Validate network format
                 cidr = int(network_data["cidr"])
-                network_obj = ipaddress.IPv4Network(
-                    f"{network_data['network']}/{cidr}", strict=False
-                )
+                broadcast = broadcast_address(network_data["network"], cidr)
 
                 # Add computed fields
                 network_data["cidr"] = cidr
-                network_data["broadcast_address"] = str(
-                    network_obj.broadcast_address
-                )
+                network_data["broadcast_address"] = broadcast
 
                 # Validate VLAN ID if provided
                 if network_data.get("vlan_id"):
@@ -150,11 +164,10 @@ class JSONImporter(BaseImporter):
 
             try:
                 # Validate IP address format
-                ipaddress.IPv4Address(host_data["ip_address"])
+                validate_ipv4(host_data["ip_address"])
 
                 # Validate status
-                valid_statuses = ["active", "inactive", "reserved"]
-                if host_data.get("status") not in valid_statuses:
+                if host_data.get("status") not in VALID_STATUSES:
                     host_data["status"] = "active"
 
                 # Validate and normalize is_assigned
@@ -163,9 +176,9 @@ class JSONImporter(BaseImporter):
                         pass
                     elif isinstance(host_data["is_assigned"], str):
                         value = host_data["is_assigned"].strip().lower()
-                        if value in ["1", "true", "yes", "on"]:
+                        if value in TRUE_VALUES:
                             host_data["is_assigned"] = True
-                        elif value in ["0", "false", "no", "off"]:
+                        elif value in FALSE_VALUES:
                             host_data["is_assigned"] = False
                         else:
                             errors.append(
@@ -2,11 +2,31 @@
 
 import os
 
+import orjson
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 
 from ipam.config import config
 from ipam.cli import init_cli
-from ipam.extensions import db, limiter, migrate
+from ipam.extensions import (
+    cache,
+    compress,
+    configure_sqlite,
+    db,
+    limiter,
+    migrate,
+)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that parses request and response bodies with orjson.
+
+    Serialisation stays with Flask's defaults, which render dates, Decimal
+    and dataclasses differently from orjson.
+    """
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 
 def create_app(config_name=None):
@@ -21,6 +41,7 @@ def create_app(config_name=None):
     app = Flask(
         __name__, template_folder="../templates", static_folder="../static"
     )
+    app.json = ORJSONProvider(app)
 
     # Load configuration
     if config_name is None:
@@ -29,8 +50,12 @@ def create_app(config_name=None):
 
     # Initialize extensions
     db.init_app(app)
+    with app.app_context():
+        configure_sqlite(db.engine, wal=app.config["SQLITE_WAL"])
     migrate.init_app(app, db)
     limiter.init_app(app)
+    cache.init_app(app)
+    compress.init_app(app)
 
     # Import models for Flask-Migrate/Alembic
     from ipam.models import Host, Network  # noqa: F401
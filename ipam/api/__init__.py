@@ -50,7 +50,7 @@ def configure_api(app):
     def require_api_token():
         if request.method == "OPTIONS" or _is_auth_exempt(request.path):
             return None
-        tokens = current_app.config.get("API_TOKENS", [])
+        tokens = current_app.config.get("API_TOKENS", ())
         if not tokens:
             return None
         token = _get_token()
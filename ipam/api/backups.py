@@ -61,11 +61,13 @@ class BackupList(Resource):
 
     @api.doc("create_backup")
     @api.marshal_with(backup, code=201)
+    @api.param("verify", "Run an integrity check on the new backup", type=bool)
     @api.response(400, "Validation Error", error)
     def post(self):
         """Create a new backup."""
+        verify = request.args.get("verify", "").lower() in {"1", "true"}
         try:
-            result = create_backup()
+            result = create_backup(verify=verify)
         except ValueError as e:
             api.abort(400, str(e))
         return result, 201
@@ -105,7 +105,9 @@ class DhcpRangeList(Resource):
         """Create a new DHCP range."""
         data = request.json
 
-        network = Network.query.get_or_404(data["network_id"])
+        network = db.get_or_404(
+            Network, data["network_id"], description="Network not found"
+        )
 
         try:
             start_ip = ipaddress.IPv4Address(data["start_ip"])
@@ -145,7 +147,9 @@ class DhcpRangeResource(Resource):
     @api.response(404, "DHCP range not found")
     def get(self, id):
         """Get a DHCP range by ID."""
-        range_obj = DhcpRange.query.get_or_404(id)
+        range_obj = db.get_or_404(
+            DhcpRange, id, description="DHCP range not found"
+        )
         return {
             "id": range_obj.id,
             "network_id": range_obj.network_id,
@@ -162,10 +166,14 @@ class DhcpRangeResource(Resource):
     @api.response(400, "Validation Error", error)
     def put(self, id):
         """Update a DHCP range."""
-        range_obj = DhcpRange.query.get_or_404(id)
+        range_obj = db.get_or_404(
+            DhcpRange, id, description="DHCP range not found"
+        )
         data = request.json
 
-        network = Network.query.get_or_404(data["network_id"])
+        network = db.get_or_404(
+            Network, data["network_id"], description="Network not found"
+        )
 
         try:
             start_ip = ipaddress.IPv4Address(data["start_ip"])
@@ -200,7 +208,9 @@ class DhcpRangeResource(Resource):
     @api.response(404, "DHCP range not found")
     def delete(self, id):
         """Delete a DHCP range."""
-        range_obj = DhcpRange.query.get_or_404(id)
+        range_obj = db.get_or_404(
+            DhcpRange, id, description="DHCP range not found"
+        )
         db.session.delete(range_obj)
         db.session.commit()
         return "", 204
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
+from sqlalchemy.orm import joinedload
 
 from ipam.extensions import db
 from ipam.models import Host, Network
@@ -79,7 +80,7 @@ class HostList(Resource):
         page = request.args.get("page", 1, type=int)
         per_page = request.args.get("per_page", 50, type=int)
 
-        query = Host.query
+        query = Host.query.options(joinedload(Host.network_ref))
 
         # Apply filters
         if hostname := request.args.get("hostname"):
@@ -221,7 +222,7 @@ class HostResource(Resource):
     @api.response(404, "Host not found")
     def get(self, id):
         """Get a specific host by ID."""
-        host_obj = Host.query.get_or_404(id)
+        host_obj = db.get_or_404(Host, id, description="Host not found")
         return {
             "id": host_obj.id,
             "ip_address": host_obj.ip_address,
@@ -248,7 +249,7 @@ class HostResource(Resource):
     @api.response(400, "Validation Error", error)
     def put(self, id):
         """Update a host."""
-        host_obj = Host.query.get_or_404(id)
+        host_obj = db.get_or_404(Host, id, description="Host not found")
         data = request.json
 
         # Validate IP address if changed
@@ -331,8 +332,7 @@ class HostResource(Resource):
     @api.response(404, "Host not found")
     def delete(self, id):
         """Delete a host."""
-        db, Host, _ = get_models()
-        host_obj = Host.query.get_or_404(id)
+        host_obj = db.get_or_404(Host, id, description="Host not found")
 
         db.session.delete(host_obj)
         db.session.commit()
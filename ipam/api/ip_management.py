@@ -4,6 +4,7 @@ import ipaddress
 
 from flask_restx import Namespace, Resource
 
+from ipam.extensions import db
 from ipam.models import DhcpRange, Host, Network
 from ipam.api.models import next_ip_model, available_ips_model, error_model
 
@@ -36,7 +37,9 @@ class NextAvailableIP(Resource):
     @api.response(400, "No available IPs", error)
     def get(self, network_id):
         """Get the next available IP address in a network."""
-        network = Network.query.get_or_404(network_id)
+        network = db.get_or_404(
+            Network, network_id, description="Network not found"
+        )
 
         # Get network range
         net = ipaddress.IPv4Network(
@@ -77,7 +80,9 @@ class AvailableIPs(Resource):
     @api.param("limit", "Limit number of IPs returned", type=int)
     def get(self, network_id):
         """Get all available IP addresses in a network."""
-        network = Network.query.get_or_404(network_id)
+        network = db.get_or_404(
+            Network, network_id, description="Network not found"
+        )
         limit = api.payload.get("limit") if api.payload else None
 
         # Get network range
@@ -153,44 +158,28 @@ class IPQuery(Resource):
             }
 
         # Check which network this IP belongs to
-        networks = Network.query.all()
-        for network in networks:
-            net = ipaddress.IPv4Network(
-                f"{network.network}/{network.cidr}", strict=False
-            )
-            if ip in net:
-                dhcp_range = None
-                for range_obj in network.dhcp_ranges:
-                    if not range_obj.is_active:
-                        continue
-                    start_ip = ipaddress.IPv4Address(range_obj.start_ip)
-                    end_ip = ipaddress.IPv4Address(range_obj.end_ip)
-                    if start_ip <= ip <= end_ip:
-                        dhcp_range = range_obj
-                        break
-
-                if dhcp_range:
-                    return {
-                        "ip_address": ip_address,
-                        "status": "dhcp",
-                        "dhcp_range": {
-                            "id": dhcp_range.id,
-                            "start_ip": dhcp_range.start_ip,
-                            "end_ip": dhcp_range.end_ip,
-                            "network_id": dhcp_range.network_id,
-                        },
-                        "network": {
-                            "id": network.id,
-                            "network": f"{network.network}/{network.cidr}",
-                            "name": network.name,
-                            "domain": network.domain,
-                            "vlan_id": network.vlan_id,
-                            "location": network.location,
-                        },
-                    }
+        network = Network.lookup_for_ip(int(ip))
+        if network:
+            dhcp_range = None
+            for range_obj in network.dhcp_ranges:
+                if not range_obj.is_active:
+                    continue
+                start_ip = ipaddress.IPv4Address(range_obj.start_ip)
+                end_ip = ipaddress.IPv4Address(range_obj.end_ip)
+                if start_ip <= ip <= end_ip:
+                    dhcp_range = range_obj
+                    break
+
+            if dhcp_range:
                 return {
                     "ip_address": ip_address,
-                    "status": "available",
+                    "status": "dhcp",
+                    "dhcp_range": {
+                        "id": dhcp_range.id,
+                        "start_ip": dhcp_range.start_ip,
+                        "end_ip": dhcp_range.end_ip,
+                        "network_id": dhcp_range.network_id,
+                    },
                     "network": {
                         "id": network.id,
                         "network": f"{network.network}/{network.cidr}",
@@ -200,6 +189,18 @@ class IPQuery(Resource):
                         "location": network.location,
                     },
                 }
+            return {
+                "ip_address": ip_address,
+                "status": "available",
+                "network": {
+                    "id": network.id,
+                    "network": f"{network.network}/{network.cidr}",
+                    "name": network.name,
+                    "domain": network.domain,
+                    "vlan_id": network.vlan_id,
+                    "location": network.location,
+                },
+            }
 
         # IP not in any managed network
         return {
@@ -42,6 +42,12 @@ network_input_model = {
     "location": fields.String(description="Physical location"),
 }
 
+network_bulk_error_model = {
+    "index": fields.Integer(description="Position in the request list"),
+    "network": fields.String(description="Network address"),
+    "message": fields.String(description="Reason the entry was skipped"),
+}
+
 # DHCP range models
 dhcp_range_model = {
     "id": fields.Integer(readonly=True, description="DHCP range ID"),
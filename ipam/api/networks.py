@@ -3,13 +3,18 @@
 import ipaddress
 
 from flask import request
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, undefer
 
+from ipam.conditional import conditional_response, make_etag, table_version
 from ipam.extensions import db
-from ipam.models import DhcpRange, Network
+from ipam.models import DhcpRange, Host, Network, host_capacity
 from ipam.api.models import (
     dhcp_range_model,
     dhcp_range_input_model,
+    network_bulk_error_model,
     network_model,
     network_input_model,
     pagination_model,
@@ -33,6 +38,16 @@ network_list = api.model(
     },
 )
 
+# Bulk create response model
+network_bulk_error = api.model("NetworkBulkError", network_bulk_error_model)
+network_bulk_result = api.model(
+    "NetworkBulkResult",
+    {
+        "created": fields.Integer(description="Number of networks created"),
+        "errors": fields.List(fields.Nested(network_bulk_error)),
+    },
+)
+
 # DHCP range models
 dhcp_range = api.model("DhcpRange", dhcp_range_model)
 dhcp_range_input = api.model("DhcpRangeInput", dhcp_range_input_model)
@@ -56,10 +71,57 @@ dhcp_range_list = api.model(
 )
 
 
+def _commit_or_abort_duplicate():
+    """Commit, turning a unique constraint violation into a 400 response."""
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        api.abort(400, "Network already exists")
+
+
+def _validate_network_input(data):
+    """Validate a network payload and return the parsed network.
+
+    Replaces flask-restx schema validation on the create/update hot path.
+    """
+    if not isinstance(data, dict):
+        api.abort(400, "Input payload validation failed")
+
+    errors = {}
+    if not isinstance(data.get("network"), str):
+        errors["network"] = "Network address is required"
+    cidr = data.get("cidr")
+    if not _is_int(cidr) or not 0 <= cidr <= 32:
+        errors["cidr"] = "CIDR must be an integer between 0 and 32"
+    vlan_id = data.get("vlan_id")
+    if vlan_id is not None and not _is_int(vlan_id):
+        errors["vlan_id"] = "VLAN ID must be an integer"
+    for field in ("name", "domain", "description", "location"):
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            errors[field] = f"{field} must be a string"
+    if errors:
+        api.abort(400, "Input payload validation failed", errors=errors)
+
+    try:
+        return ipaddress.IPv4Network(
+            f"{data['network']}/{data['cidr']}", strict=False
+        )
+    except ValueError as e:
+        api.abort(400, f"Invalid network address: {e}")
+
+
+def _is_int(value):
+    """Return True for JSON integers (booleans excluded)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 @api.route("")
 class NetworkList(Resource):
     @api.doc("list_networks")
-    @api.marshal_with(network_list)
+    @api.response(200, "Success", network_list)
+    @api.response(304, "Not modified")
     @api.param("page", "Page number", type=int, default=1)
     @api.param("per_page", "Items per page", type=int, default=50)
     @api.param("name", "Filter by network name")
@@ -84,13 +146,35 @@ class NetworkList(Resource):
         if location := request.args.get("location"):
             query = query.filter(Network.location.ilike(f"%{location}%"))
 
-        # Paginate results
-        pagination_obj = query.paginate(
+        # Version the filtered result set so unchanged pages can be skipped
+        count, last_update = query.with_entities(
+            func.count(Network.id), func.max(Network.updated_at)
+        ).one()
+        etag = make_etag(
+            request.query_string.decode(),
+            count,
+            last_update,
+            *table_version(Host),
+        )
+        return conditional_response(
+            etag,
+            lambda: marshal(self._page(query, page, per_page), network_list),
+        )
+
+    @staticmethod
+    def _page(query, page, per_page):
+        """Return one page of networks as a response body."""
+        # Host counts come from a correlated subquery in the page query,
+        # so no list of page ids is bound however large per_page is
+        pagination_obj = query.options(undefer(Network.host_count)).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
-        return {
-            "data": [
+        data = []
+        for n in pagination_obj.items:
+            total = host_capacity(n.cidr)
+            used = n.host_count
+            data.append(
                 {
                     "id": n.id,
                     "network": n.network,
@@ -101,12 +185,14 @@ class NetworkList(Resource):
                     "vlan_id": n.vlan_id,
                     "description": n.description,
                     "location": n.location,
-                    "total_hosts": n.total_hosts,
-                    "used_hosts": n.used_hosts,
-                    "available_hosts": n.available_hosts,
+                    "total_hosts": total,
+                    "used_hosts": used,
+                    "available_hosts": total - used,
                 }
-                for n in pagination_obj.items
-            ],
+            )
+
+        return {
+            "data": data,
             "pagination": {
                 "page": pagination_obj.page,
                 "per_page": pagination_obj.per_page,
@@ -116,33 +202,20 @@ class NetworkList(Resource):
         }
 
     @api.doc("create_network")
-    @api.expect(network_input, validate=True)
+    @api.expect(network_input)
     @api.marshal_with(network, code=201)
     @api.response(400, "Validation Error", error)
     def post(self):
         """Create a new network."""
 
         data = request.json
-
-        # Validate network address
-        try:
-            net = ipaddress.IPv4Network(
-                f"{data['network']}/{data['cidr']}", strict=False
-            )
-            broadcast = str(net.broadcast_address)
-        except ValueError as e:
-            api.abort(400, f"Invalid network address: {e}")
-
-        # Check for duplicate
-        existing = Network.query.filter_by(network=data["network"]).first()
-        if existing:
-            api.abort(400, "Network already exists")
+        net = _validate_network_input(data)
 
         # Create network
         network_obj = Network(
             network=data["network"],
             cidr=data["cidr"],
-            broadcast_address=broadcast,
+            broadcast_address=str(net.broadcast_address),
             name=data.get("name"),
             domain=data.get("domain"),
             vlan_id=data.get("vlan_id"),
@@ -151,7 +224,7 @@ class NetworkList(Resource):
         )
 
         db.session.add(network_obj)
-        db.session.commit()
+        _commit_or_abort_duplicate()
 
         return {
             "id": network_obj.id,
@@ -169,15 +242,109 @@ class NetworkList(Resource):
         }, 201
 
 
+@api.route("/bulk")
+class NetworkBulk(Resource):
+    @api.doc("bulk_create_networks")
+    @api.expect([network_input], validate=True)
+    @api.marshal_with(network_bulk_result, code=201)
+    @api.response(400, "Validation Error", error)
+    def post(self):
+        """Create multiple networks in a single transaction."""
+
+        data = request.json
+        if not isinstance(data, list):
+            api.abort(400, "Expected a list of networks")
+
+        existing = {
+            row.network
+            for row in db.session.query(Network.network).filter(
+                Network.network.in_({item["network"] for item in data})
+            )
+        }
+
+        records = []
+        errors = []
+        for index, item in enumerate(data):
+            if item["network"] in existing:
+                errors.append(
+                    {
+                        "index": index,
+                        "network": item["network"],
+                        "message": "Network already exists",
+                    }
+                )
+                continue
+            try:
+                net = ipaddress.IPv4Network(
+                    f"{item['network']}/{item['cidr']}", strict=False
+                )
+            except ValueError as e:
+                errors.append(
+                    {
+                        "index": index,
+                        "network": item["network"],
+                        "message": f"Invalid network address: {e}",
+                    }
+                )
+                continue
+
+            # Also rejects repeats within the same request
+            existing.add(item["network"])
+            records.append(
+                {
+                    "network": item["network"],
+                    "cidr": item["cidr"],
+                    "broadcast_address": str(net.broadcast_address),
+                    "name": item.get("name"),
+                    "domain": item.get("domain"),
+                    "vlan_id": item.get("vlan_id"),
+                    "description": item.get("description"),
+                    "location": item.get("location"),
+                    "network_start": int(net.network_address),
+                    "network_end": int(net.broadcast_address),
+                }
+            )
+
+        if records:
+            try:
+                db.session.execute(insert(Network), records)
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent request created one of the networks
+                db.session.rollback()
+                api.abort(400, "Network already exists")
+
+        return {"created": len(records), "errors": errors}, 201
+
+
 @api.route("/<int:id>")
 @api.param("id", "The network identifier")
 class NetworkResource(Resource):
     @api.doc("get_network")
-    @api.marshal_with(network)
+    @api.response(200, "Success", network)
+    @api.response(304, "Not modified")
     @api.response(404, "Network not found")
     def get(self, id):
         """Get a specific network by ID."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network, id, description="Network not found"
+        )
+        # The version probe already counts the hosts, so the body reuses it
+        # instead of loading the hosts collection
+        used, last_update = table_version(
+            Host, Host.network_id == network_obj.id
+        )
+        etag = make_etag(
+            network_obj.id, network_obj.updated_at, used, last_update
+        )
+        return conditional_response(
+            etag, lambda: marshal(self._body(network_obj, used), network)
+        )
+
+    @staticmethod
+    def _body(network_obj, used):
+        """Return a network with used host addresses as a response body."""
+        total = network_obj.total_hosts
         return {
             "id": network_obj.id,
             "network": network_obj.network,
@@ -188,44 +355,26 @@ class NetworkResource(Resource):
             "vlan_id": network_obj.vlan_id,
             "description": network_obj.description,
             "location": network_obj.location,
-            "total_hosts": network_obj.total_hosts,
-            "used_hosts": network_obj.used_hosts,
-            "available_hosts": network_obj.available_hosts,
+            "total_hosts": total,
+            "used_hosts": used,
+            "available_hosts": total - used,
         }
 
     @api.doc("update_network")
-    @api.expect(network_input, validate=True)
+    @api.expect(network_input)
     @api.marshal_with(network)
     @api.response(404, "Network not found")
     @api.response(400, "Validation Error", error)
     def put(self, id):
         """Update a network."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network, id, description="Network not found"
+        )
         data = request.json
-
-        # Validate network address if changed
-        if (
-            data["network"] != network_obj.network
-            or data["cidr"] != network_obj.cidr
-        ):
-            try:
-                net = ipaddress.IPv4Network(
-                    f"{data['network']}/{data['cidr']}", strict=False
-                )
-                network_obj.broadcast_address = str(net.broadcast_address)
-            except ValueError as e:
-                api.abort(400, f"Invalid network address: {e}")
-
-            # Check for duplicate
-            existing = (
-                Network.query.filter_by(network=data["network"])
-                .filter(Network.id != id)
-                .first()
-            )
-            if existing:
-                api.abort(400, "Network already exists")
+        net = _validate_network_input(data)
 
         # Update fields
+        network_obj.broadcast_address = str(net.broadcast_address)
         network_obj.network = data["network"]
         network_obj.cidr = data["cidr"]
         network_obj.name = data.get("name")
@@ -234,7 +383,7 @@ class NetworkResource(Resource):
         network_obj.description = data.get("description")
         network_obj.location = data.get("location")
 
-        db.session.commit()
+        _commit_or_abort_duplicate()
 
         return {
             "id": network_obj.id,
@@ -257,14 +406,18 @@ class NetworkResource(Resource):
     @api.response(400, "Cannot delete network with assigned hosts", error)
     def delete(self, id):
         """Delete a network."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network, id, description="Network not found"
+        )
 
         # Check for assigned hosts
-        if network_obj.hosts:
+        host_count = db.session.scalar(
+            select(func.count(Host.id)).where(Host.network_id == id)
+        )
+        if host_count:
             api.abort(
                 400,
-                f"Cannot delete network with {len(network_obj.hosts)} "
-                f"assigned hosts",
+                f"Cannot delete network with {host_count} assigned hosts",
             )
 
         db.session.delete(network_obj)
@@ -280,7 +433,12 @@ class NetworkHosts(Resource):
     @api.response(404, "Network not found")
     def get(self, id):
         """Get all hosts in a specific network."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network,
+            id,
+            description="Network not found",
+            options=[joinedload(Network.hosts)],
+        )
         return {
             "network_id": network_obj.id,
             "network": f"{network_obj.network}/{network_obj.cidr}",
@@ -307,7 +465,9 @@ class NetworkDhcpRanges(Resource):
     @api.response(404, "Network not found")
     def get(self, id):
         """Get DHCP ranges for a specific network."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network, id, description="Network not found"
+        )
         return {
             "data": [
                 {
@@ -328,7 +488,9 @@ class NetworkDhcpRanges(Resource):
     @api.response(400, "Validation Error", error)
     def post(self, id):
         """Create a DHCP range for a network."""
-        network_obj = Network.query.get_or_404(id)
+        network_obj = db.get_or_404(
+            Network, id, description="Network not found"
+        )
         data = request.json
 
         try:
@@ -29,9 +29,12 @@ def init_cli(app):
             )
 
     @backup.command("create")
-    def create_command():
+    @click.option(
+        "--verify", is_flag=True, help="Run an integrity check on the backup."
+    )
+    def create_command(verify):
         """Create a new backup."""
-        result = create_backup()
+        result = create_backup(verify=verify)
         click.echo(
             f"Created {result['name']} "
             f"(integrity: {result['integrity_message']})"
@@ -0,0 +1,45 @@
+"""Helpers for ETag based conditional GET responses."""
+
+import hashlib
+
+from flask import make_response, request, session
+from sqlalchemy import func
+
+from ipam.extensions import db
+
+
+def make_etag(*parts):
+    """Build an ETag value from the parts that identify a representation."""
+    key = ":".join(str(part) for part in parts)
+    return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+
+def table_version(model, *criteria):
+    """Return (row count, last update) of the rows matching criteria.
+
+    Derived from the database rather than per-process counters so that
+    every gunicorn worker agrees on the current version.
+    """
+    return (
+        db.session.query(func.count(model.id), func.max(model.updated_at))
+        .filter(*criteria)
+        .one()
+    )
+
+
+def conditional_response(etag, build):
+    """Return 304 if the client already has etag, else build() as response.
+
+    Responses carrying flashed messages are never cached, since replaying
+    them would show the message again.
+    """
+    if "_flashes" in session:
+        return make_response(build())
+
+    if request.if_none_match.contains_weak(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(build())
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
@@ -2,6 +2,8 @@
 
 import os
 
+from sqlalchemy.pool import StaticPool
+
 
 def _get_bool_env(name, default):
     """Return a boolean from an environment variable."""
@@ -23,15 +25,42 @@ class Config:
         "DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'ipam.db')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "query_cache_size": int(
+            os.environ.get("SQLALCHEMY_QUERY_CACHE_SIZE", 1200)
+        )
+    }
+    # WAL needs shared memory; disable on network filesystems such as NFS
+    SQLITE_WAL = _get_bool_env("SQLITE_WAL", True)
     BACKUP_DIR = os.environ.get("BACKUP_DIR", os.path.join(BASE_DIR, "backups"))
-    API_TOKENS = [
+    API_TOKENS = frozenset(
         token.strip()
         for token in os.environ.get("API_TOKENS", "").split(",")
         if token.strip()
-    ]
+    )
     API_RATE_LIMIT = os.environ.get("API_RATE_LIMIT", "200 per minute")
-    RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "memory://")
+    # Counters must be shared between gunicorn workers to enforce a global
+    # limit, so fall back to REDIS_URL before the per-process memory backend.
+    RATELIMIT_STORAGE_URI = os.environ.get(
+        "RATELIMIT_STORAGE_URI"
+    ) or os.environ.get("REDIS_URL", "memory://")
     RATELIMIT_ENABLED = _get_bool_env("RATELIMIT_ENABLED", True)
+    # Rendered list pages; keys include the data version, so entries are
+    # never stale, only evicted. Use RedisCache to share across workers.
+    CACHE_TYPE = os.environ.get("CACHE_TYPE", "SimpleCache")
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get("CACHE_DEFAULT_TIMEOUT", 60))
+    CACHE_REDIS_URL = os.environ.get("REDIS_URL")
+    # gzip pages, JSON and exports; streamed exports are compressed per chunk
+    COMPRESS_ALGORITHM = ["gzip"]
+    COMPRESS_ALGORITHM_STREAMING = ["gzip"]
+    COMPRESS_MIMETYPES = [
+        "text/html",
+        "application/json",
+        "text/csv",
+        "text/plain",
+    ]
+    COMPRESS_LEVEL = 6
+    COMPRESS_MIN_SIZE = 1024
 
 
 class DevelopmentConfig(Config):
@@ -46,8 +75,27 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+class TestingConfig(Config):
+    """Testing configuration."""
+
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # One shared connection, so every session sees the same database
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        "connect_args": {"check_same_thread": False},
+        "poolclass": StaticPool,
+    }
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_RECORD_QUERIES = False
+    PROPAGATE_EXCEPTIONS = True
+    WTF_CSRF_ENABLED = False
+    RATELIMIT_ENABLED = False
+
+
 config = {
     "development": DevelopmentConfig,
     "production": ProductionConfig,
+    "testing": TestingConfig,
     "default": DevelopmentConfig,
 }
@@ -1,11 +1,42 @@
 """Flask extensions initialization."""
 
+from flask_caching import Cache
+from flask_compress import Compress
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 # Initialize extensions without app
 db = SQLAlchemy()
 migrate = Migrate()
 limiter = Limiter(key_func=get_remote_address)
+cache = Cache()
+compress = Compress()
+
+
+def configure_sqlite(engine, wal=True):
+    """Apply performance PRAGMAs to connections of a file based SQLite DB.
+
+    WAL lets readers run alongside an import; with it, synchronous=NORMAL
+    only syncs at checkpoints and stays crash safe. In-memory and non
+    SQLite databases are left untouched.
+    """
+    if engine.dialect.name != "sqlite" or engine.url.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if wal:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
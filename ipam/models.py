@@ -1,14 +1,78 @@
 """SQLAlchemy models."""
 
 import ipaddress
+import socket
+from datetime import datetime, timezone
+from functools import cached_property, lru_cache
+
+from sqlalchemy import func, select
 
 from ipam.extensions import db
 
 
+@lru_cache(maxsize=4096)
+def ip_to_int(address):
+    """Return a dotted-quad IPv4 address as an integer.
+
+    Raises ValueError for anything that is not a strict dotted quad.
+    """
+    # inet_pton rather than inet_aton: the latter accepts "10.1" or "010.0.0.1"
+    try:
+        packed = socket.inet_pton(socket.AF_INET, address)
+    except (OSError, TypeError) as e:
+        raise ValueError(f"{address!r} is not a valid IPv4 address") from e
+    return int.from_bytes(packed, "big")
+
+
+def int_to_ip(value):
+    """Return an integer IPv4 address in dotted-quad notation."""
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+@lru_cache(maxsize=1024)
+def network_bounds(network, cidr):
+    """Return the (first, last) address of a network as integers."""
+    if network is None or cidr is None:
+        return None, None
+    try:
+        address = ip_to_int(network)
+        host_bits = 32 - int(cidr)
+    except (TypeError, ValueError):
+        return None, None
+    if not 0 <= host_bits <= 32:
+        return None, None
+    first = address >> host_bits << host_bits
+    return first, first | ((1 << host_bits) - 1)
+
+
+@lru_cache(maxsize=1024)
+def parse_network(network, cidr):
+    """Return network/cidr as an IPv4Network, with host bits cleared.
+
+    IPv4Network is immutable, so instances can be shared between rows.
+    """
+    return ipaddress.IPv4Network(f"{network}/{cidr}", strict=False)
+
+
+def host_capacity(cidr):
+    """Return the number of usable host addresses in a prefix length."""
+    # /31 and /32 have no network/broadcast addresses to exclude
+    size = 1 << (32 - cidr)
+    return size if cidr >= 31 else max(0, size - 2)
+
+
+def _utcnow():
+    """Return the current UTC time as a naive datetime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Network(db.Model):
     """Network model."""
 
     __tablename__ = "networks"
+    __table_args__ = (
+        db.Index("ix_networks_range", "network_start", "network_end"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     network = db.Column(db.String(18), nullable=False, unique=True)
@@ -19,37 +83,67 @@ class Network(db.Model):
     vlan_id = db.Column(db.Integer)
     description = db.Column(db.Text)
     location = db.Column(db.String(100))
+    # Integer address range, kept in sync with network/cidr for range lookups
+    network_start = db.Column(db.BigInteger)
+    network_end = db.Column(db.BigInteger)
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow)
 
+    # Lazy by default; list views count hosts through host_count instead
     hosts = db.relationship(
-        "Host", backref="network_ref", lazy=True, cascade="all, delete-orphan"
+        "Host",
+        backref="network_ref",
+        lazy="select",
+        cascade="all, delete-orphan",
     )
     dhcp_ranges = db.relationship(
         "DhcpRange",
         backref="network_ref",
-        lazy=True,
+        lazy="select",
         cascade="all, delete-orphan",
     )
 
     def __repr__(self):
         return f"<Network {self.network}/{self.cidr}>"
 
+    @db.validates("network", "cidr")
+    def _sync_range(self, key, value):
+        network = value if key == "network" else self.network
+        cidr = value if key == "cidr" else self.cidr
+        self.network_start, self.network_end = network_bounds(network, cidr)
+        self.__dict__.pop("ip_network", None)
+        return value
+
+    @classmethod
+    def lookup_for_ip(cls, ip_int):
+        """Return the most specific network containing an integer address."""
+        return (
+            cls.query.filter(
+                cls.network_start <= ip_int, cls.network_end >= ip_int
+            )
+            .order_by(cls.network_start.desc(), cls.network_end.asc())
+            .first()
+        )
+
+    @cached_property
+    def ip_network(self):
+        """Parsed network, cached until network or cidr changes."""
+        return parse_network(self.network, self.cidr)
+
     @property
     def network_address(self):
-        network = ipaddress.IPv4Network(
-            f"{self.network}/{self.cidr}", strict=False
-        )
-        return str(network.network_address)
+        return str(self.ip_network.network_address)
 
     @property
     def total_hosts(self):
-        network = ipaddress.IPv4Network(
-            f"{self.network}/{self.cidr}", strict=False
-        )
-        return len(list(network.hosts()))
+        return host_capacity(self.cidr)
 
     @property
     def used_hosts(self):
-        return len(self.hosts)
+        # A loaded collection also counts unflushed hosts; otherwise use the
+        # host_count aggregate instead of loading every host row
+        if "hosts" in self.__dict__ or self.id is None:
+            return len(self.hosts)
+        return self.host_count
 
     @property
     def available_hosts(self):
@@ -72,13 +166,25 @@ class Host(db.Model):
     discovery_source = db.Column(db.String(50))
     is_assigned = db.Column(db.Boolean, default=False, nullable=False)
     network_id = db.Column(
-        db.Integer, db.ForeignKey("networks.id"), nullable=True
+        db.Integer, db.ForeignKey("networks.id"), nullable=True, index=True
     )
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow)
 
     def __repr__(self):
         return f"<Host {self.ip_address}>"
 
 
+# Deferred so plain network queries skip the subquery; list views and
+# exports load it up front with undefer(Network.host_count)
+Network.host_count = db.column_property(
+    select(func.count(Host.id))
+    .where(Host.network_id == Network.id)
+    .correlate_except(Host)
+    .scalar_subquery(),
+    deferred=True,
+)
+
+
 class DhcpRange(db.Model):
     """DHCP range model."""
 
@@ -86,7 +192,7 @@ class DhcpRange(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     network_id = db.Column(
-        db.Integer, db.ForeignKey("networks.id"), nullable=False
+        db.Integer, db.ForeignKey("networks.id"), nullable=False, index=True
     )
     start_ip = db.Column(db.String(15), nullable=False)
     end_ip = db.Column(db.String(15), nullable=False)
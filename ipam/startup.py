@@ -9,6 +9,11 @@ DEFAULT_GUNICORN_ARGS = [
     "0.0.0.0:5000",
     "--workers",
     "4",
+    # Threads let each worker overlap requests blocked on database I/O
+    "--worker-class",
+    "gthread",
+    "--threads",
+    "4",
     "--timeout",
     "120",
     "app:app",
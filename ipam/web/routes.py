@@ -1,21 +1,36 @@
 """Web UI routes for IPAM."""
 
+import bisect
 import ipaddress
 
+import orjson
 from flask import (
     Response,
     current_app,
     flash,
-    jsonify,
+    g,
     redirect,
     render_template,
     request,
+    session,
+    stream_with_context,
     url_for,
 )
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import selectinload, undefer
 
-from ipam.extensions import db
+from ipam.conditional import conditional_response, make_etag, table_version
+from ipam.extensions import cache, db
 from ipam.forms import DhcpRangeForm, HostForm, ImportForm, NetworkForm
-from ipam.models import DhcpRange, Host, Network
+from ipam.models import (
+    DhcpRange,
+    Host,
+    Network,
+    host_capacity,
+    int_to_ip,
+    ip_to_int,
+    network_bounds,
+)
 from ipam.web import web_bp
 from ipam.backup import (
     create_backup,
@@ -23,9 +38,42 @@ from ipam.backup import (
     restore_backup,
     verify_backup,
 )
-from exporters import get_exporter, get_available_exporters
+from exporters import get_available_exporters, get_exporter, iter_blocks
 from importers import get_importer, get_available_importers
 
+EXPORT_BATCH_SIZE = 1000
+
+# Statements built once at import; their compiled form is then reused
+# from the engine's query cache
+NETWORK_ROWS_STMT = select(Network.id, Network.network, Network.cidr)
+HOST_COUNTS_STMT = select(Host.network_id, func.count(Host.id)).group_by(
+    Host.network_id
+)
+NETWORKS_STMT = select(
+    Network.id,
+    Network.network,
+    Network.cidr,
+    Network.broadcast_address,
+    Network.name,
+    Network.domain,
+    Network.vlan_id,
+    Network.description,
+    Network.location,
+)
+HOSTS_STMT = select(
+    Host.id,
+    Host.ip_address,
+    Host.hostname,
+    Host.cname,
+    Host.mac_address,
+    Host.description,
+    Host.status,
+    Host.network_id,
+)
+# Table inserts skip the ORM bulk path's per-row mapping work
+NETWORK_INSERT_STMT = insert(Network.__table__)
+HOST_INSERT_STMT = insert(Host.__table__)
+
 
 def _validate_dhcp_range(network, start_ip, end_ip, exclude_range_id=None):
     """Validate DHCP range boundaries and overlaps."""
@@ -52,28 +100,100 @@ def _validate_dhcp_range(network, start_ip, end_ip, exclude_range_id=None):
     return None
 
 
+def _broadcast_address(network, cidr):
+    """Return the broadcast address of network/cidr as a string."""
+    _, last = network_bounds(network, cidr)
+    if last is None:
+        raise ValueError(f"{network}/{cidr} is not a valid IPv4 network")
+    return int_to_ip(last)
+
+
+def _apply_network_form(network, form):
+    """Copy NetworkForm data onto network and return it.
+
+    Raises ValueError before changing anything if network/cidr is invalid.
+    """
+    broadcast = _broadcast_address(form.network.data, form.cidr.data)
+    network.network = form.network.data
+    network.cidr = form.cidr.data
+    network.broadcast_address = broadcast
+    network.name = form.name.data
+    network.domain = form.domain.data
+    network.vlan_id = form.vlan_id.data
+    network.description = form.description.data
+    network.location = form.location.data
+    return network
+
+
+def _data_etag(*models):
+    """Return an ETag for the current page over the given tables."""
+    parts = [request.path]
+    for model in models:
+        parts.extend(table_version(model))
+    return make_etag(*parts)
+
+
+def _cached_page(models, render):
+    """Serve a page via ETag revalidation and the rendered-page cache.
+
+    The cache key embeds the data version, so any write to the given
+    tables moves readers to a fresh key instead of needing invalidation.
+    """
+    etag = _data_etag(*models)
+
+    def build():
+        # Pages with pending flash messages are rendered per user
+        if "_flashes" in session:
+            return render()
+        key = f"view:{etag}"
+        page = cache.get(key)
+        if page is None:
+            page = render()
+            cache.set(key, page)
+        return page
+
+    return conditional_response(etag, build)
+
+
+def _json_response(payload):
+    """Return payload as a JSON response encoded with orjson."""
+    return Response(orjson.dumps(payload), mimetype="application/json")
+
+
 @web_bp.route("/")
 def index():
     """Home page with overview."""
-    networks_list = Network.query.all()
-    hosts_list = Host.query.all()
-    return render_template(
-        "index.html", networks=networks_list, hosts=hosts_list
-    )
+
+    def render():
+        networks_list = Network.query.options(undefer(Network.host_count)).all()
+        hosts_list = Host.query.all()
+        return render_template(
+            "index.html", networks=networks_list, hosts=hosts_list
+        )
+
+    return _cached_page((Network, Host), render)
 
 
 @web_bp.route("/networks")
 def networks():
     """Networks list page."""
-    networks_list = Network.query.all()
-    return render_template("networks.html", networks=networks_list)
+
+    def render():
+        networks_list = Network.query.options(undefer(Network.host_count)).all()
+        return render_template("networks.html", networks=networks_list)
+
+    return _cached_page((Network, Host), render)
 
 
 @web_bp.route("/hosts")
 def hosts():
     """Hosts list page."""
-    hosts_list = Host.query.all()
-    return render_template("hosts.html", hosts=hosts_list)
+
+    def render():
+        hosts_list = Host.query.options(selectinload(Host.network_ref)).all()
+        return render_template("hosts.html", hosts=hosts_list)
+
+    return _cached_page((Host, Network), render)
 
 
 @web_bp.route("/add_network", methods=["GET", "POST"])
@@ -82,21 +202,7 @@ def add_network():
     form = NetworkForm()
     if form.validate_on_submit():
         try:
-            network_obj = ipaddress.IPv4Network(
-                f"{form.network.data}/{form.cidr.data}", strict=False
-            )
-            broadcast = str(network_obj.broadcast_address)
-
-            network = Network(
-                network=form.network.data,
-                cidr=form.cidr.data,
-                broadcast_address=broadcast,
-                name=form.name.data,
-                domain=form.domain.data,
-                vlan_id=form.vlan_id.data,
-                description=form.description.data,
-                location=form.location.data,
-            )
+            network = _apply_network_form(Network(), form)
             db.session.add(network)
             db.session.commit()
             flash("Network added successfully!", "success")
@@ -114,8 +220,9 @@ def add_network():
 def add_host():
     """Add new host."""
     form = HostForm()
+    networks = _network_rows()
     form.network_id.choices = [(0, "Auto-detect")] + [
-        (n.id, f"{n.network}/{n.cidr}") for n in Network.query.all()
+        (n.id, f"{n.network}/{n.cidr}") for n in networks
     ]
     if request.method == "GET":
         form.is_assigned.data = current_app.config.get(
@@ -126,14 +233,7 @@ def add_host():
         network_id = form.network_id.data if form.network_id.data != 0 else None
 
         if not network_id:
-            ip = ipaddress.IPv4Address(form.ip_address.data)
-            for network in Network.query.all():
-                net = ipaddress.IPv4Network(
-                    f"{network.network}/{network.cidr}", strict=False
-                )
-                if ip in net:
-                    network_id = network.id
-                    break
+            network_id = _lookup_network_id(form.ip_address.data)
 
         host = Host(
             ip_address=form.ip_address.data,
@@ -156,26 +256,13 @@ def add_host():
 @web_bp.route("/edit_network/<int:network_id>", methods=["GET", "POST"])
 def edit_network(network_id):
     """Edit existing network."""
-    network = Network.query.get_or_404(network_id)
+    network = db.get_or_404(Network, network_id)
     form = NetworkForm(obj=network)
     dhcp_range_form = DhcpRangeForm()
 
     if form.validate_on_submit():
         try:
-            network_obj = ipaddress.IPv4Network(
-                f"{form.network.data}/{form.cidr.data}", strict=False
-            )
-            broadcast = str(network_obj.broadcast_address)
-
-            network.network = form.network.data
-            network.cidr = form.cidr.data
-            network.broadcast_address = broadcast
-            network.name = form.name.data
-            network.domain = form.domain.data
-            network.vlan_id = form.vlan_id.data
-            network.description = form.description.data
-            network.location = form.location.data
-
+            _apply_network_form(network, form)
             db.session.commit()
             flash("Network updated successfully!", "success")
             return redirect(url_for("web.networks"))
@@ -193,7 +280,7 @@ def edit_network(network_id):
 @web_bp.route("/networks/<int:network_id>/dhcp-ranges", methods=["POST"])
 def add_dhcp_range(network_id):
     """Add DHCP range to a network."""
-    network = Network.query.get_or_404(network_id)
+    network = db.get_or_404(Network, network_id)
     form = DhcpRangeForm()
     if not form.validate_on_submit():
         flash("Invalid DHCP range data.", "error")
@@ -222,7 +309,7 @@ def add_dhcp_range(network_id):
 @web_bp.route("/dhcp-ranges/<int:range_id>/delete", methods=["POST"])
 def delete_dhcp_range(range_id):
     """Delete a DHCP range."""
-    dhcp_range = DhcpRange.query.get_or_404(range_id)
+    dhcp_range = db.get_or_404(DhcpRange, range_id)
     network_id = dhcp_range.network_id
     db.session.delete(dhcp_range)
     db.session.commit()
@@ -246,11 +333,7 @@ def create_backup_route():
     """Create a new backup."""
     try:
         result = create_backup()
-        message = (
-            f"Backup created: {result['name']} "
-            f"(integrity: {result['integrity_message']})"
-        )
-        flash(message, "success")
+        flash(f"Backup created: {result['name']}", "success")
     except ValueError as e:
         flash(str(e), "error")
     return redirect(url_for("web.backups"))
@@ -289,24 +372,18 @@ def restore_backup_route(name):
 @web_bp.route("/edit_host/<int:host_id>", methods=["GET", "POST"])
 def edit_host(host_id):
     """Edit existing host."""
-    host = Host.query.get_or_404(host_id)
+    host = db.get_or_404(Host, host_id)
     form = HostForm(obj=host)
+    networks = _network_rows()
     form.network_id.choices = [(0, "Auto-detect")] + [
-        (n.id, f"{n.network}/{n.cidr}") for n in Network.query.all()
+        (n.id, f"{n.network}/{n.cidr}") for n in networks
     ]
 
     if form.validate_on_submit():
         network_id = form.network_id.data if form.network_id.data != 0 else None
 
         if not network_id:
-            ip = ipaddress.IPv4Address(form.ip_address.data)
-            for network in Network.query.all():
-                net = ipaddress.IPv4Network(
-                    f"{network.network}/{network.cidr}", strict=False
-                )
-                if ip in net:
-                    network_id = network.id
-                    break
+            network_id = _lookup_network_id(form.ip_address.data)
 
         host.ip_address = form.ip_address.data
         host.hostname = form.hostname.data
@@ -327,12 +404,15 @@ def edit_host(host_id):
 @web_bp.route("/delete_network/<int:network_id>", methods=["POST"])
 def delete_network(network_id):
     """Delete network."""
-    network = Network.query.get_or_404(network_id)
+    network = db.get_or_404(Network, network_id)
 
     # Check if network has hosts
-    if network.hosts:
+    host_count = db.session.scalar(
+        select(func.count(Host.id)).where(Host.network_id == network_id)
+    )
+    if host_count:
         flash(
-            f"Cannot delete network: {len(network.hosts)} hosts are still "
+            f"Cannot delete network: {host_count} hosts are still "
             f"assigned to this network",
             "error",
         )
@@ -347,7 +427,7 @@ def delete_network(network_id):
 @web_bp.route("/delete_host/<int:host_id>", methods=["POST"])
 def delete_host(host_id):
     """Delete host."""
-    host = Host.query.get_or_404(host_id)
+    host = db.get_or_404(Host, host_id)
     db.session.delete(host)
     db.session.commit()
     flash("Host deleted successfully!", "success")
@@ -357,47 +437,37 @@ def delete_host(host_id):
 @web_bp.route("/api/networks")
 def api_networks():
     """Legacy API endpoint for networks (JSON)."""
-    networks_list = Network.query.all()
-    return jsonify(
-        [
-            {
-                "id": n.id,
-                "network": n.network,
-                "cidr": n.cidr,
-                "broadcast_address": n.broadcast_address,
-                "name": n.name,
-                "domain": n.domain,
-                "vlan_id": n.vlan_id,
-                "description": n.description,
-                "location": n.location,
-                "total_hosts": n.total_hosts,
-                "used_hosts": n.used_hosts,
-                "available_hosts": n.available_hosts,
-            }
-            for n in networks_list
-        ]
-    )
+    return conditional_response(_data_etag(Network, Host), _networks_json)
+
+
+def _networks_json():
+    """Serialize all networks with their host usage."""
+    # Plain column tuples plus one grouped count avoid hydrating ORM objects
+    host_counts = dict(db.session.execute(HOST_COUNTS_STMT).all())
+    rows = db.session.execute(NETWORKS_STMT).all()
+
+    networks_list = []
+    for row in rows:
+        network = row._asdict()
+        total = host_capacity(row.cidr)
+        used = host_counts.get(row.id, 0)
+        network.update(
+            total_hosts=total, used_hosts=used, available_hosts=total - used
+        )
+        networks_list.append(network)
+    return _json_response(networks_list)
 
 
 @web_bp.route("/api/hosts")
 def api_hosts():
     """Legacy API endpoint for hosts (JSON)."""
-    hosts_list = Host.query.all()
-    return jsonify(
-        [
-            {
-                "id": h.id,
-                "ip_address": h.ip_address,
-                "hostname": h.hostname,
-                "cname": h.cname,
-                "mac_address": h.mac_address,
-                "description": h.description,
-                "status": h.status,
-                "network_id": h.network_id,
-            }
-            for h in hosts_list
-        ]
-    )
+    return conditional_response(_data_etag(Host), _hosts_json)
+
+
+def _hosts_json():
+    """Serialize all hosts."""
+    rows = db.session.execute(HOSTS_STMT).all()
+    return _json_response([row._asdict() for row in rows])
 
 
 @web_bp.route("/export/<export_type>/<format_name>")
@@ -406,20 +476,22 @@ def export_data(export_type, format_name):
     try:
         exporter = get_exporter(format_name)
 
+        # Rows are loaded in batches while the response is being sent
         if export_type == "networks":
-            networks_list = Network.query.all()
-            data = exporter.export_networks(networks_list)
+            # Exporters only count hosts per network
+            query = Network.query.options(undefer(Network.host_count))
+            data = exporter.iter_networks(query.yield_per(EXPORT_BATCH_SIZE))
             filename = f"networks.{exporter.file_extension}"
         elif export_type == "hosts":
-            hosts_list = Host.query.all()
-            data = exporter.export_hosts(hosts_list)
+            query = Host.query.options(selectinload(Host.network_ref))
+            data = exporter.iter_hosts(query.yield_per(EXPORT_BATCH_SIZE))
             filename = f"hosts.{exporter.file_extension}"
         else:
             flash("Invalid export type", "error")
             return redirect(url_for("web.index"))
 
         return Response(
-            data,
+            stream_with_context(iter_blocks(data)),
             mimetype=exporter.mime_type,
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -467,8 +539,8 @@ def import_data():
             # Get importer
             importer = get_importer(format_type)
 
-            # Read file content
-            file_content = file_obj.read()
+            # Importers read the upload stream themselves
+            file_content = file_obj.stream
 
             # Import and validate data
             if import_type == "networks":
@@ -511,6 +583,8 @@ def import_data():
                 return redirect(url_for("web.hosts"))
 
         except Exception as e:
+            # Each import is a single transaction, so nothing is kept
+            db.session.rollback()
             flash(f"Import failed: {str(e)}", "error")
 
     return render_template("import_data.html", form=form)
@@ -523,76 +597,155 @@ def import_csv():
     return redirect(url_for("web.import_data"))
 
 
+def _network_rows():
+    """Return (id, network, cidr) rows of all networks, once per request."""
+    if "network_rows" not in g:
+        g.network_rows = db.session.execute(NETWORK_ROWS_STMT).all()
+    return g.network_rows
+
+
+def _lookup_network_id(ip_address):
+    """Return the id of the most specific network containing ip_address.
+
+    A single indexed range query, for one-off lookups; bulk imports use
+    the in-memory index from _build_network_index() instead.
+    """
+    network = Network.lookup_for_ip(ip_to_int(ip_address))
+    return network.id if network else None
+
+
+def _build_network_index(networks):
+    """Return a lookup index of network address ranges.
+
+    The index is (sorted range starts, sorted ranges, parents) where each
+    range is (first, last, id) and parents[i] is the position of the
+    tightest range enclosing range i, or -1. Ranges with the same start are
+    ordered widest first so an enclosing range always comes before the
+    ranges it contains.
+    """
+    ranges = sorted(
+        (
+            (*network_bounds(network.network, network.cidr), network.id)
+            for network in networks
+        ),
+        key=lambda r: (r[0], -r[1]),
+    )
+    parents = []
+    open_ranges = []
+    for i, (first, last, _) in enumerate(ranges):
+        # CIDR ranges are nested or disjoint, so any range still open when
+        # this one starts encloses it
+        while open_ranges and ranges[open_ranges[-1]][1] < first:
+            open_ranges.pop()
+        parents.append(open_ranges[-1] if open_ranges else -1)
+        open_ranges.append(i)
+    return [r[0] for r in ranges], ranges, parents
+
+
+def _detect_network_id(ip_address, index):
+    """Return the id of the most specific network containing ip_address."""
+    starts, ranges, parents = index
+    ip_int = ip_to_int(ip_address)
+    # Every range containing the address encloses the last range starting
+    # at or before it, so only that range's ancestors need checking
+    i = bisect.bisect_right(starts, ip_int) - 1
+    while i >= 0:
+        first, last, network_id = ranges[i]
+        if ip_int <= last:
+            return network_id
+        i = parents[i]
+    return None
+
+
+def _existing_values(column, values, chunk_size=500):
+    """Return the subset of values already stored in column.
+
+    Queries in chunks to stay below SQLite's bound parameter limit.
+    """
+    values = list(values)
+    existing = set()
+    for i in range(0, len(values), chunk_size):
+        chunk = values[i : i + chunk_size]
+        existing.update(
+            value
+            for (value,) in db.session.query(column).filter(column.in_(chunk))
+        )
+    return existing
+
+
 def _create_networks_from_data(networks_data):
-    """Create Network objects from validated data."""
-    imported_count = 0
+    """Create networks from validated data with one bulk INSERT."""
+    # One lookup for all rows; also tracks duplicates within the file
+    seen = _existing_values(
+        Network.network, {row["network"] for row in networks_data}
+    )
+    rows = []
 
     for network_data in networks_data:
-        # Check if network already exists
-        existing_network = Network.query.filter_by(
-            network=network_data["network"]
-        ).first()
-        if existing_network:
+        if network_data["network"] in seen:
             continue
+        seen.add(network_data["network"])
 
-        network = Network(
-            network=network_data["network"],
-            cidr=network_data["cidr"],
-            broadcast_address=network_data["broadcast_address"],
-            vlan_id=network_data.get("vlan_id"),
-            location=network_data.get("location", ""),
-            description=network_data.get("description", ""),
+        # Core inserts bypass the model validator that fills the range
+        network_start, network_end = network_bounds(
+            network_data["network"], network_data["cidr"]
+        )
+        rows.append(
+            {
+                "network": network_data["network"],
+                "cidr": network_data["cidr"],
+                "broadcast_address": network_data["broadcast_address"],
+                "vlan_id": network_data.get("vlan_id"),
+                "location": network_data.get("location", ""),
+                "description": network_data.get("description", ""),
+                "network_start": network_start,
+                "network_end": network_end,
+            }
         )
 
-        db.session.add(network)
-        imported_count += 1
-
+    if rows:
+        db.session.execute(NETWORK_INSERT_STMT, rows)
     db.session.commit()
-    return imported_count
+    return len(rows)
 
 
 def _create_hosts_from_data(hosts_data):
-    """Create Host objects from validated data."""
-    imported_count = 0
+    """Create hosts from validated data with one bulk INSERT."""
     assign_on_create = current_app.config.get("HOST_ASSIGN_ON_CREATE", True)
+    # Not _network_rows(): an import may have just added networks
+    index = _build_network_index(db.session.execute(NETWORK_ROWS_STMT))
+    seen = _existing_values(
+        Host.ip_address, {row["ip_address"] for row in hosts_data}
+    )
+    rows = []
 
     for host_data in hosts_data:
-        # Check if host already exists
-        existing_host = Host.query.filter_by(
-            ip_address=host_data["ip_address"]
-        ).first()
-        if existing_host:
+        if host_data["ip_address"] in seen:
             continue
-
-        # Auto-detect network
-        network_id = None
-        ip = ipaddress.IPv4Address(host_data["ip_address"])
-        for network in Network.query.all():
-            net = ipaddress.IPv4Network(
-                f"{network.network}/{network.cidr}", strict=False
-            )
-            if ip in net:
-                network_id = network.id
-                break
+        seen.add(host_data["ip_address"])
 
         is_assigned = host_data.get("is_assigned")
         if is_assigned is None:
             is_assigned = assign_on_create
 
-        host = Host(
-            ip_address=host_data["ip_address"],
-            hostname=host_data.get("hostname", ""),
-            mac_address=host_data.get("mac_address", ""),
-            status=host_data.get("status", "active"),
-            description=host_data.get("description", ""),
-            last_seen=host_data.get("last_seen"),
-            discovery_source=host_data.get("discovery_source"),
-            is_assigned=is_assigned,
-            network_id=network_id,
+        rows.append(
+            {
+                "ip_address": host_data["ip_address"],
+                "hostname": host_data.get("hostname", ""),
+                "mac_address": host_data.get("mac_address", ""),
+                "status": host_data.get("status", "active"),
+                "description": host_data.get("description", ""),
+                "last_seen": host_data.get("last_seen"),
+                "discovery_source": host_data.get("discovery_source"),
+                "is_assigned": is_assigned,
+                # Auto-detect network
+                "network_id": _detect_network_id(
+                    host_data["ip_address"], index
+                ),
+            }
         )
 
-        db.session.add(host)
-        imported_count += 1
-
+    if rows:
+        db.session.execute(HOST_INSERT_STMT, rows)
     db.session.commit()
-    return imported_count
+    return len(rows)
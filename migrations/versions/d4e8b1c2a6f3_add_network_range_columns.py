@@ -0,0 +1,59 @@
+"""Add integer address range columns to networks."""
+
+import ipaddress
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d4e8b1c2a6f3"
+down_revision = "c3f2a4b7d9e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("networks") as batch_op:
+        batch_op.add_column(
+            sa.Column("network_start", sa.BigInteger(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column("network_end", sa.BigInteger(), nullable=True)
+        )
+        batch_op.create_index(
+            "ix_networks_range", ["network_start", "network_end"]
+        )
+
+    bind = op.get_bind()
+    networks = sa.table(
+        "networks",
+        sa.column("id", sa.Integer),
+        sa.column("network", sa.String),
+        sa.column("cidr", sa.Integer),
+        sa.column("network_start", sa.BigInteger),
+        sa.column("network_end", sa.BigInteger),
+    )
+    rows = bind.execute(
+        sa.select(networks.c.id, networks.c.network, networks.c.cidr)
+    ).all()
+    for row in rows:
+        try:
+            net = ipaddress.IPv4Network(
+                f"{row.network}/{row.cidr}", strict=False
+            )
+        except ValueError:
+            continue
+        bind.execute(
+            networks.update()
+            .where(networks.c.id == row.id)
+            .values(
+                network_start=int(net.network_address),
+                network_end=int(net.broadcast_address),
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("networks") as batch_op:
+        batch_op.drop_index("ix_networks_range")
+        batch_op.drop_column("network_end")
+        batch_op.drop_column("network_start")
@@ -0,0 +1,26 @@
+"""Add updated_at columns to networks and hosts."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e7a9c3d5f1b8"
+down_revision = "d4e8b1c2a6f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name in ("networks", "hosts"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(
+                sa.Column("updated_at", sa.DateTime(), nullable=True)
+            )
+        op.execute(
+            sa.text(f"UPDATE {table_name} SET updated_at = CURRENT_TIMESTAMP")
+        )
+
+
+def downgrade():
+    for table_name in ("hosts", "networks"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("updated_at")
@@ -0,0 +1,18 @@
+"""Index the network_id foreign keys of hosts and DHCP ranges."""
+
+from alembic import op
+
+revision = "f2b6d8e4a1c7"
+down_revision = "e7a9c3d5f1b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_hosts_network_id", "hosts", ["network_id"])
+    op.create_index("ix_dhcp_ranges_network_id", "dhcp_ranges", ["network_id"])
+
+
+def downgrade():
+    op.drop_index("ix_dhcp_ranges_network_id", table_name="dhcp_ranges")
+    op.drop_index("ix_hosts_network_id", table_name="hosts")
@@ -1,48 +1,201 @@
 """Test fixtures for IPAM."""
 
-import os
-import tempfile
+from contextlib import contextmanager
 
 import pytest
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
 
 from ipam import create_app
-from ipam.extensions import db
+from ipam.extensions import cache, db
+from ipam.models import Host, Network
 
 
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    db_fd, db_path = tempfile.mkstemp()
+@pytest.fixture(scope="session")
+def _app():
+    """Create the application and schema once for the whole test session.
 
-    app = create_app("default")
-    app.config.update(
-        {
-            "TESTING": True,
-            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-            "WTF_CSRF_ENABLED": False,
-            "API_TOKENS": ["test-token"],
-            "RATELIMIT_ENABLED": False,
-        }
-    )
+    Under pytest-xdist every worker is its own process, so each one gets a
+    private in-memory database.
+    """
+    # Engine options are read when the extensions are initialised, so the
+    # database settings come from TestingConfig rather than config.update()
+    app = create_app("testing")
+    app.config.update({"API_TOKENS": ["test-token"]})
 
     with app.app_context():
+        _enable_sqlite_savepoints(db.engine)
         db.create_all()
         yield app
-        db.session.remove()
         db.drop_all()
 
-    os.close(db_fd)
-    os.unlink(db_path)
+
+def _enable_sqlite_savepoints(engine):
+    """Let pysqlite emit BEGIN itself so SAVEPOINTs nest correctly.
+
+    See "Serializable isolation / Savepoints / Transactional DDL" in the
+    SQLAlchemy SQLite dialect documentation.
+    """
+
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+class _ConnectionSession(Session):
+    """Session that always uses its bound connection.
+
+    Flask-SQLAlchemy's session resolves models to the engine, which would
+    bypass the per-test transaction.
+    """
+
+    def get_bind(self, *args, **kwargs):
+        return self.bind
+
+
+@pytest.fixture
+def app(_app):
+    """Run each test in a transaction that is rolled back afterwards.
+
+    Commits made by the code under test only release a SAVEPOINT, so the
+    schema is created once and every test still starts from empty tables.
+    """
+    with _app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        session = db.session
+        db.session = db._make_scoped_session(
+            {
+                "class_": _ConnectionSession,
+                "bind": connection,
+                "join_transaction_mode": "create_savepoint",
+            }
+        )
+        cache.clear()
+        try:
+            yield _app
+        finally:
+            db.session.remove()
+            db.session = session
+            transaction.rollback()
+            connection.close()
+
+
+@pytest.fixture
+def db_session(app):
+    """Return the scoped session joined to the test's transaction."""
+    return db.session
+
+
+@pytest.fixture
+def network_id(db_session):
+    """Create the 192.168.1.0/24 network most route tests use; return its id.
+
+    Function scoped: a session-wide row would show up in every test that
+    counts networks, and the insert is rolled back with the test anyway.
+    """
+    network = Network(network="192.168.1.0", cidr=24)
+    db_session.add(network)
+    db_session.commit()
+    return network.id
+
+
+@pytest.fixture
+def network_with_host(db_session):
+    """Create a /24 network holding one host; return (network_id, host_id)."""
+    network = Network(
+        network="192.168.103.0", cidr=24, broadcast_address="192.168.103.255"
+    )
+    db_session.add(network)
+    db_session.flush()
+    host = Host(
+        ip_address="192.168.103.10", hostname="test-host", network_id=network.id
+    )
+    db_session.add(host)
+    db_session.commit()
+    return network.id, host.id
+
+
+@pytest.fixture(autouse=True)
+def _raise_on_lazy_load(request):
+    """Make route tests fail on any relationship the view did not eager-load.
+
+    A lazy load per row is how N+1 queries creep into list views.
+    """
+    if "client" not in request.fixturenames:
+        yield
+        return
+
+    request.getfixturevalue("app")
+    session = db.session
+
+    def add_raiseload(state):
+        if (
+            state.is_select
+            and not state.is_column_load
+            and not state.is_relationship_load
+        ):
+            state.statement = state.statement.options(raiseload("*"))
+
+    event.listen(session, "do_orm_execute", add_raiseload)
+    try:
+        yield
+    finally:
+        event.remove(session, "do_orm_execute", add_raiseload)
 
 
 @pytest.fixture
 def client(app):
     """Create test client."""
+    # Function scoped on purpose: the app is already shared per session and
+    # a client costs microseconds, but its cookie jar would carry session
+    # data and flashed messages from one test into the next.
     return app.test_client()
 
 
+@pytest.fixture
+def flashes(client):
+    """Return a callable listing the messages flashed by the last request.
+
+    Tests of redirecting views check the flash instead of following the
+    redirect, so the target list page is not rendered for every assertion.
+    """
+
+    def read():
+        with client.session_transaction() as session:
+            return [message for _, message in session.get("_flashes", [])]
+
+    return read
+
+
 @pytest.fixture
 def app_context(app):
     """Create application context."""
     with app.app_context():
         yield app
+
+
+@pytest.fixture
+def count_queries(app):
+    """Return a context manager collecting the SQL statements executed."""
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return counter
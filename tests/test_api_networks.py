@@ -0,0 +1,227 @@
+"""Network API endpoint tests."""
+
+import ipaddress
+
+from sqlalchemy import insert
+
+from ipam.extensions import db
+from ipam.models import Host, Network, network_bounds
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+class TestNetworkApi:
+    def _create(self, client, network, cidr=24):
+        return client.post(
+            "/api/v1/networks",
+            json={"network": network, "cidr": cidr},
+            headers=AUTH,
+        )
+
+    def test_create_network(self, client):
+        response = self._create(client, "192.168.1.0")
+        assert response.status_code == 201
+        assert response.get_json()["broadcast_address"] == "192.168.1.255"
+
+    def test_create_network_malformed_json(self, client):
+        response = client.post(
+            "/api/v1/networks",
+            data=b'{"network": "10.0.0.0",',
+            content_type="application/json",
+            headers=AUTH,
+        )
+        assert response.status_code == 400
+
+    def test_create_duplicate_network(self, client):
+        assert self._create(client, "192.168.1.0").status_code == 201
+
+        response = self._create(client, "192.168.1.0")
+        assert response.status_code == 400
+        assert "already exists" in response.get_json()["message"]
+
+        # The session is usable again after the rollback
+        assert self._create(client, "192.168.2.0").status_code == 201
+
+    def test_update_to_duplicate_network(self, client):
+        self._create(client, "192.168.1.0")
+        network_id = self._create(client, "192.168.2.0").get_json()["id"]
+
+        response = client.put(
+            f"/api/v1/networks/{network_id}",
+            json={"network": "192.168.1.0", "cidr": 24},
+            headers=AUTH,
+        )
+        assert response.status_code == 400
+        assert "already exists" in response.get_json()["message"]
+
+        response = client.get(f"/api/v1/networks/{network_id}", headers=AUTH)
+        assert response.get_json()["network"] == "192.168.2.0"
+
+    def test_bulk_create_networks(self, client):
+        self._create(client, "10.0.0.0")
+
+        response = client.post(
+            "/api/v1/networks/bulk",
+            json=[
+                {"network": "10.0.1.0", "cidr": 24, "name": "one"},
+                {"network": "10.0.2.0", "cidr": 24},
+                {"network": "10.0.0.0", "cidr": 24},
+                {"network": "10.0.2.0", "cidr": 24},
+                {"network": "10.0.3.x", "cidr": 24},
+            ],
+            headers=AUTH,
+        )
+        assert response.status_code == 201
+        result = response.get_json()
+        assert result["created"] == 2
+        assert [e["index"] for e in result["errors"]] == [2, 3, 4]
+
+        network = Network.query.filter_by(network="10.0.1.0").one()
+        assert network.name == "one"
+        assert network.broadcast_address == "10.0.1.255"
+        assert Network.lookup_for_ip(int(ipaddress.IPv4Address("10.0.2.9")))
+
+    def test_update_unknown_network_with_invalid_body(self, client):
+        response = client.put(
+            "/api/v1/networks/99999",
+            json={"network": "invalid", "cidr": 24},
+            headers=AUTH,
+        )
+        assert response.status_code == 404
+
+    def test_bulk_create_requires_list(self, client):
+        response = client.post(
+            "/api/v1/networks/bulk",
+            json={"network": "10.0.1.0", "cidr": 24},
+            headers=AUTH,
+        )
+        assert response.status_code == 400
+
+    def test_get_network_conditional(self, client):
+        network_id = self._create(client, "192.168.1.0").get_json()["id"]
+        url = f"/api/v1/networks/{network_id}"
+
+        response = client.get(url, headers=AUTH)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = client.get(url, headers={**AUTH, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+        # Adding a host changes used_hosts and therefore the ETag
+        db.session.add(Host(ip_address="192.168.1.10", network_id=network_id))
+        db.session.commit()
+        response = client.get(url, headers={**AUTH, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json()["used_hosts"] == 1
+
+    def test_list_networks_host_counts(self, client):
+        first = self._create(client, "192.168.1.0").get_json()["id"]
+        self._create(client, "192.168.2.0")
+        db.session.add_all(
+            [
+                Host(ip_address="192.168.1.10", network_id=first),
+                Host(ip_address="192.168.1.11", network_id=first),
+            ]
+        )
+        db.session.commit()
+
+        response = client.get("/api/v1/networks", headers=AUTH)
+        counts = {
+            n["network"]: (n["used_hosts"], n["available_hosts"])
+            for n in response.get_json()["data"]
+        }
+        assert counts == {"192.168.1.0": (2, 252), "192.168.2.0": (0, 254)}
+
+    def test_list_networks_large_page_binds_no_ids(self, client, count_queries):
+        rows = []
+        for i in range(600):
+            network = f"10.{i // 256}.{i % 256}.0"
+            start, end = network_bounds(network, 24)
+            rows.append(
+                {
+                    "network": network,
+                    "cidr": 24,
+                    "network_start": start,
+                    "network_end": end,
+                }
+            )
+        db.session.execute(insert(Network), rows)
+        db.session.commit()
+
+        url = "/api/v1/networks?per_page=100000"
+        with count_queries() as statements:
+            data = client.get(url, headers=AUTH).get_json()["data"]
+        assert len(data) == 600
+        assert all(n["used_hosts"] == 0 for n in data)
+        # Counts are correlated in SQL rather than bound as an IN list
+        assert not any(" IN (" in s for s in statements)
+
+    def test_list_networks_conditional(self, client):
+        self._create(client, "192.168.1.0")
+
+        response = client.get("/api/v1/networks", headers=AUTH)
+        etag = response.headers["ETag"]
+        response = client.get(
+            "/api/v1/networks", headers={**AUTH, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        self._create(client, "192.168.2.0")
+        response = client.get(
+            "/api/v1/networks", headers={**AUTH, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.get_json()["pagination"]["total_items"] == 2
+
+    def test_get_missing_network(self, client):
+        response = client.get("/api/v1/networks/999", headers=AUTH)
+        assert response.status_code == 404
+        assert response.get_json()["message"].startswith("Network not found")
+
+    def test_network_hosts_and_delete(self, client):
+        network_id = self._create(client, "192.168.1.0").get_json()["id"]
+        db.session.add(Host(ip_address="192.168.1.10", network_id=network_id))
+        db.session.commit()
+
+        response = client.get(
+            f"/api/v1/networks/{network_id}/hosts", headers=AUTH
+        )
+        assert [h["ip_address"] for h in response.get_json()["hosts"]] == [
+            "192.168.1.10"
+        ]
+
+        response = client.delete(f"/api/v1/networks/{network_id}", headers=AUTH)
+        assert response.status_code == 400
+        assert "1 assigned hosts" in response.get_json()["message"]
+
+    def test_create_network_validation(self, client):
+        response = client.post(
+            "/api/v1/networks",
+            json={"network": "10.0.0.0", "cidr": 33},
+            headers=AUTH,
+        )
+        assert response.status_code == 400
+        assert "cidr" in response.get_json()["errors"]
+
+        response = client.post(
+            "/api/v1/networks", json={"cidr": 24}, headers=AUTH
+        )
+        assert response.status_code == 400
+        assert "network" in response.get_json()["errors"]
+
+        response = self._create(client, "10.0.0.x")
+        assert response.status_code == 400
+        assert "Invalid network address" in response.get_json()["message"]
+
+    def test_update_network_recomputes_broadcast(self, client):
+        network_id = self._create(client, "10.0.0.0").get_json()["id"]
+        response = client.put(
+            f"/api/v1/networks/{network_id}",
+            json={"network": "10.0.0.0", "cidr": 25, "name": "half"},
+            headers=AUTH,
+        )
+        assert response.status_code == 200
+        assert response.get_json()["broadcast_address"] == "10.0.0.127"
+        assert response.get_json()["name"] == "half"
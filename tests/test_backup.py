@@ -3,7 +3,12 @@
 import sqlite3
 
 from ipam import create_app
-from ipam.backup import create_backup, list_backups, restore_backup
+from ipam.backup import (
+    create_backup,
+    list_backups,
+    restore_backup,
+    verify_backup,
+)
 
 
 def _seed_db(path):
@@ -28,12 +33,14 @@ def test_backup_restore_cycle(tmp_path):
     db_path = tmp_path / "ipam.db"
     _seed_db(db_path)
 
-    app = create_app()
+    # A private app rather than the shared fixture: restore_backup()
+    # disposes the engine, which would drop the shared in-memory database
+    app = create_app("testing")
     app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
     app.config["BACKUP_DIR"] = str(tmp_path / "backups")
 
     with app.app_context():
-        backup_result = create_backup()
+        backup_result = create_backup(verify=True)
         backups = list_backups()
 
         assert backup_result["integrity_ok"] is True
@@ -51,3 +58,18 @@ def test_backup_restore_cycle(tmp_path):
         restore_backup(backup_result["name"])
 
         assert _count_items(db_path) == 1
+
+
+def test_create_backup_skips_integrity_check_by_default(tmp_path):
+    db_path = tmp_path / "ipam.db"
+    _seed_db(db_path)
+
+    app = create_app("testing")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["BACKUP_DIR"] = str(tmp_path / "backups")
+
+    with app.app_context():
+        backup_result = create_backup()
+
+        assert backup_result["integrity_ok"] is None
+        assert verify_backup(backup_result["name"])["integrity_ok"] is True
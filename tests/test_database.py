@@ -1,250 +1,185 @@
 """Test database initialization and table creation."""
 
-import os
-import tempfile
-
 import pytest
+from sqlalchemy import create_engine, exists, select
+from sqlalchemy.pool import NullPool
 
-from ipam import create_app
-from ipam.extensions import db
+from ipam.extensions import configure_sqlite, db
 from ipam.models import DhcpRange, Host, Network
 
 
+@pytest.fixture(scope="session")
+def schema(_app):
+    """Reflect the column names of every table once per test session."""
+    with _app.app_context():
+        inspector = db.inspect(db.engine)
+        return {
+            table: frozenset(c["name"] for c in inspector.get_columns(table))
+            for table in inspector.get_table_names()
+        }
+
+
 class TestDatabaseInitialization:
     """Test database creation and schema."""
 
-    def test_database_tables_created(self):
+    def test_database_tables_created(self, schema):
         """Test that all required tables are created."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        # Create app with temporary database
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            # Create all tables
-            db.create_all()
-
-            # Get all table names
-            inspector = db.inspect(db.engine)
-            tables = inspector.get_table_names()
-
-            # Verify required tables exist
-            assert "networks" in tables
-            assert "hosts" in tables
-
-            # Clean up
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
-
-    def test_network_table_schema(self):
-        """Test that network table has correct columns."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            db.create_all()
-
-            # Get network table columns
-            inspector = db.inspect(db.engine)
-            columns = [c["name"] for c in inspector.get_columns("networks")]
-
-            # Verify required columns exist
-            required_columns = [
-                "id",
-                "network",
-                "cidr",
-                "broadcast_address",
-                "name",
-                "domain",
-                "vlan_id",
-                "description",
-                "location",
-            ]
-
-            for col in required_columns:
-                assert (
-                    col in columns
-                ), f"Column '{col}' missing from networks table"
-
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
-
-    def test_host_table_schema(self):
-        """Test that host table has correct columns."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            db.create_all()
-
-            # Get host table columns
-            inspector = db.inspect(db.engine)
-            columns = [c["name"] for c in inspector.get_columns("hosts")]
-
-            # Verify required columns exist
-            required_columns = [
-                "id",
-                "ip_address",
-                "hostname",
-                "cname",
-                "mac_address",
-                "description",
-                "status",
-                "network_id",
-            ]
-
-            for col in required_columns:
-                assert (
-                    col in columns
-                ), f"Column '{col}' missing from hosts table"
-
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
-
-    def test_dhcp_range_table_schema(self):
-        """Test that DHCP ranges table has correct columns."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            db.create_all()
-
-            inspector = db.inspect(db.engine)
-            columns = [c["name"] for c in inspector.get_columns("dhcp_ranges")]
-
-            required_columns = [
-                "id",
-                "network_id",
-                "start_ip",
-                "end_ip",
-                "description",
-                "is_active",
-            ]
-
-            for col in required_columns:
-                assert (
-                    col in columns
-                ), f"Column '{col}' missing from dhcp_ranges table"
-
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
-
-    def test_database_relationships(self):
+        assert {"networks", "hosts", "dhcp_ranges"} <= schema.keys()
+
+    @pytest.mark.parametrize(
+        "table,required_columns",
+        [
+            (
+                "networks",
+                [
+                    "id",
+                    "network",
+                    "cidr",
+                    "broadcast_address",
+                    "name",
+                    "domain",
+                    "vlan_id",
+                    "description",
+                    "location",
+                ],
+            ),
+            (
+                "hosts",
+                [
+                    "id",
+                    "ip_address",
+                    "hostname",
+                    "cname",
+                    "mac_address",
+                    "description",
+                    "status",
+                    "network_id",
+                ],
+            ),
+            (
+                "dhcp_ranges",
+                [
+                    "id",
+                    "network_id",
+                    "start_ip",
+                    "end_ip",
+                    "description",
+                    "is_active",
+                ],
+            ),
+        ],
+    )
+    def test_table_schema(self, schema, table, required_columns):
+        """Test that each table has the expected columns."""
+        missing = set(required_columns) - schema[table]
+        assert not missing, f"Columns {missing} missing from {table} table"
+
+    def test_database_relationships(self, db_session):
         """Test that database relationships work correctly."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            db.create_all()
-
-            # Create a network
-            network = Network(
-                network="192.168.1.0",
-                cidr=24,
-                broadcast_address="192.168.1.255",
-                name="Test Network",
-            )
-            db.session.add(network)
-            db.session.commit()
-
-            # Create a host in that network
-            host = Host(
-                ip_address="192.168.1.10",
-                hostname="test-host",
-                network_id=network.id,
-            )
-            db.session.add(host)
-            db.session.commit()
-
-            # Verify relationship works
-            assert len(network.hosts) == 1
-            assert network.hosts[0].hostname == "test-host"
-            assert host.network_ref.name == "Test Network"
-
-            # Create DHCP range for network
-            dhcp_range = DhcpRange(
-                network_id=network.id,
-                start_ip="192.168.1.50",
-                end_ip="192.168.1.100",
-            )
-            db.session.add(dhcp_range)
-            db.session.commit()
-
-            assert len(network.dhcp_ranges) == 1
-            assert network.dhcp_ranges[0].start_ip == "192.168.1.50"
-            assert dhcp_range.network_ref.name == "Test Network"
-
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
-
-    def test_cascade_delete(self):
+        # Create a network
+        network = Network(
+            network="192.168.1.0",
+            cidr=24,
+            broadcast_address="192.168.1.255",
+            name="Test Network",
+        )
+        db_session.add(network)
+        db_session.flush()
+
+        # Create a host in that network
+        host = Host(
+            ip_address="192.168.1.10",
+            hostname="test-host",
+            network_id=network.id,
+        )
+        db_session.add(host)
+        db_session.commit()
+
+        # Verify relationship works
+        assert len(network.hosts) == 1
+        assert network.hosts[0].hostname == "test-host"
+        assert host.network_ref.name == "Test Network"
+
+        # Create DHCP range for network
+        dhcp_range = DhcpRange(
+            network_id=network.id,
+            start_ip="192.168.1.50",
+            end_ip="192.168.1.100",
+        )
+        db_session.add(dhcp_range)
+        db_session.commit()
+
+        assert len(network.dhcp_ranges) == 1
+        assert network.dhcp_ranges[0].start_ip == "192.168.1.50"
+        assert dhcp_range.network_ref.name == "Test Network"
+
+    def test_cascade_delete(self, db_session):
         """Test that deleting a network cascades to hosts."""
-        # Create temporary database file
-        db_fd, db_path = tempfile.mkstemp()
-
-        app = create_app("default")
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-        app.config["TESTING"] = True
-
-        with app.app_context():
-            db.create_all()
-
-            # Create network with hosts
-            network = Network(
-                network="192.168.2.0",
-                cidr=24,
-                broadcast_address="192.168.2.255",
-            )
-            db.session.add(network)
-            db.session.commit()
-
-            host1 = Host(ip_address="192.168.2.10", network_id=network.id)
-            host2 = Host(ip_address="192.168.2.11", network_id=network.id)
-            db.session.add_all([host1, host2])
-            db.session.commit()
-
-            network_id = network.id
-            host_ids = [host1.id, host2.id]
-
-            # Delete network
-            db.session.delete(network)
-            db.session.commit()
-
-            # Verify hosts were also deleted (cascade)
-            assert db.session.get(Network, network_id) is None
-            for host_id in host_ids:
-                assert db.session.get(Host, host_id) is None
-
-            db.drop_all()
-
-        os.close(db_fd)
-        os.unlink(db_path)
+        # Create network with hosts
+        network = Network(
+            network="192.168.2.0",
+            cidr=24,
+            broadcast_address="192.168.2.255",
+        )
+        db_session.add(network)
+        db_session.flush()
+
+        host1 = Host(ip_address="192.168.2.10", network_id=network.id)
+        host2 = Host(ip_address="192.168.2.11", network_id=network.id)
+        db_session.add_all([host1, host2])
+        db_session.commit()
+
+        network_id = network.id
+        host_ids = [host1.id, host2.id]
+
+        # Delete network
+        db_session.delete(network)
+        db_session.commit()
+
+        # Verify hosts were also deleted (cascade)
+        assert not db_session.scalar(
+            select(exists().where(Network.id == network_id))
+        )
+        assert not db_session.scalar(
+            select(exists().where(Host.id.in_(host_ids)))
+        )
+
+
+def _file_engine(tmp_path):
+    """Return an engine on a throwaway database file.
+
+    NullPool closes each connection when it is returned, so no handle
+    stays open on the file once a test is done with it.
+    """
+    return create_engine(
+        f"sqlite:///{tmp_path / 'ipam.db'}", poolclass=NullPool
+    )
+
+
+class TestSqlitePragmas:
+    """Test connection PRAGMAs for file based SQLite databases."""
+
+    def test_file_database_uses_wal(self, tmp_path):
+        engine = _file_engine(tmp_path)
+        configure_sqlite(engine)
+
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+            assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+
+    def test_wal_can_be_disabled(self, tmp_path):
+        engine = _file_engine(tmp_path)
+        configure_sqlite(engine, wal=False)
+
+        with engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            assert mode == "delete"
+
+    def test_memory_database_untouched(self):
+        engine = create_engine("sqlite:///:memory:")
+        configure_sqlite(engine)
+
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 0
+        engine.dispose()
@@ -1,17 +1,36 @@
 """Test export and import functionality."""
 
+import gzip
+import ipaddress
 import json
+import re
 from io import BytesIO
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
 
+from exporters import BLOCK_SIZE, iter_blocks
 from exporters.csv_exporter import CSVExporter
 from exporters.dnsmasq_exporter import DNSmasqExporter
 from exporters.json_exporter import JSONExporter
+from importers import broadcast_address
 from importers.csv_importer import CSVImporter
 from importers.json_importer import JSONImporter
 from ipam.extensions import db
-from ipam.models import Host, Network
+from ipam.models import Host, Network, network_bounds
+from ipam.web.routes import _build_network_index, _detect_network_id
+
+
+def _csv_upload(header, rows):
+    """Return an upload stream with header and rows written line by line."""
+    upload = BytesIO()
+    upload.write(f"{header}\n".encode())
+    for row in rows:
+        upload.write(f"{row}\n".encode())
+    upload.seek(0)
+    return upload
 
 
 class TestExporters:
@@ -112,6 +131,22 @@ class TestExporters:
         assert len(json_data["data"]) == 1
         assert json_data["data"][0]["ip_address"] == "192.168.1.10"
 
+    def test_json_exporter_matches_stdlib_layout(self, app_context):
+        """JSON export keeps the json.dumps(indent=2) byte layout."""
+        hosts = [
+            Host(ip_address="192.168.1.10", hostname="zürich-01"),
+            Host(ip_address="192.168.1.11", description="line\nbreak"),
+        ]
+        db.session.add_all(hosts)
+        db.session.commit()
+
+        exported_data = JSONExporter().export_hosts(hosts)
+
+        expected = json.dumps(
+            json.loads(exported_data), indent=2, ensure_ascii=False
+        )
+        assert exported_data == expected.encode("utf-8")
+
     def test_dnsmasq_exporter_hosts(self, app_context):
         """Test DNSmasq export for hosts."""
         # Create test hosts with different scenarios
@@ -324,6 +359,15 @@ class TestExporters:
         assert "# DHCP reservations: 1" in dnsmasq_content
         assert "# DNS records: 1" in dnsmasq_content
 
+    def test_iter_blocks_coalesces_chunks(self):
+        """Small chunks are joined into blocks of at least block_size."""
+        chunks = [b"abc"] * 10
+        blocks = list(iter_blocks(chunks, block_size=8))
+
+        assert b"".join(blocks) == b"abc" * 10
+        assert [len(block) for block in blocks] == [9, 9, 9, 3]
+        assert list(iter_blocks([])) == []
+
 
 class TestImporters:
     def test_csv_importer_networks(self):
@@ -355,6 +399,34 @@ class TestImporters:
         assert hosts_data[0]["hostname"] == "server01"
         assert hosts_data[1]["status"] == "inactive"
 
+    def test_csv_importer_short_rows(self):
+        """Missing columns and short rows fall back to defaults."""
+        csv_content = b"IP Address,Hostname\n192.168.1.10\n\n192.168.1.11,db\n"
+
+        hosts_data = CSVImporter().import_hosts(csv_content)
+
+        assert len(hosts_data) == 2
+        assert hosts_data[0]["hostname"] == ""
+        assert hosts_data[0]["status"] == "active"
+        assert hosts_data[1]["hostname"] == "db"
+        assert hosts_data[1]["mac_address"] == ""
+
+    @pytest.mark.parametrize(
+        "importer,content",
+        [
+            (CSVImporter(), b"IP Address,Hostname\n192.168.1.10,db\n"),
+            (JSONImporter(), b'[{"ip_address": "192.168.1.10"}]'),
+        ],
+    )
+    def test_importer_reads_file_objects(self, importer, content):
+        """Importers accept a binary file and leave it open."""
+        stream = BytesIO(content)
+
+        hosts_data = importer.import_hosts(stream)
+
+        assert hosts_data[0]["ip_address"] == "192.168.1.10"
+        assert not stream.closed
+
     def test_csv_importer_validate_networks(self):
         """Test network data validation."""
         networks_data = [
@@ -390,6 +462,28 @@ class TestImporters:
         assert valid_data[0]["cidr"] == 24
         assert valid_data[0]["vlan_id"] == 100
 
+    @pytest.mark.parametrize(
+        "network,cidr",
+        [("10.0.0.5", 24), ("10.0.0.0", 0), ("10.0.0.0", 32), ("1.2.3.4", 31)],
+    )
+    def test_broadcast_address_matches_ipaddress(self, network, cidr):
+        """The fast broadcast computation agrees with ipaddress."""
+        expected = ipaddress.IPv4Network(f"{network}/{cidr}", strict=False)
+        assert broadcast_address(network, cidr) == str(
+            expected.broadcast_address
+        )
+
+    @pytest.mark.parametrize(
+        "network,cidr",
+        [("10.0.0.0", 33), ("10.0.0.0", -1), ("10.1", 8), ("10.0.0.0\x00", 8)],
+    )
+    def test_broadcast_address_invalid(self, network, cidr):
+        """Invalid networks raise the same error as ipaddress does."""
+        with pytest.raises(ValueError) as expected:
+            ipaddress.IPv4Network(f"{network}/{cidr}", strict=False)
+        with pytest.raises(ValueError, match=re.escape(str(expected.value))):
+            broadcast_address(network, cidr)
+
     def test_csv_importer_validate_hosts(self):
         """Test host data validation."""
         hosts_data = [
@@ -423,6 +517,24 @@ class TestImporters:
         assert len(errors) == 2
         assert valid_data[0]["ip_address"] == "192.168.1.10"
 
+    @pytest.mark.parametrize(
+        "address,message",
+        [
+            ("10.1", "Expected 4 octets in '10.1'"),
+            ("010.0.0.1", "Leading zeros are not permitted in '010'"),
+            ("10.0.0.256", "Octet 256 (> 255) not permitted"),
+            ("10.0.0.1\x00", "Only decimal digits permitted"),
+        ],
+    )
+    def test_csv_importer_invalid_ip_message(self, address, message):
+        """Rejected addresses keep the ipaddress error message."""
+        importer = CSVImporter()
+        _, errors = importer.validate_hosts_data([{"ip_address": address}])
+
+        assert len(errors) == 1
+        assert errors[0].startswith("Row 2: Invalid IP address - ")
+        assert message in errors[0]
+
     def test_json_importer_networks(self):
         """Test JSON import for networks."""
         json_content = json.dumps(
@@ -591,6 +703,58 @@ class TestExportRoutes:
         )
         assert b"192.168.1.0" in response.data
 
+    def test_export_networks_counts_hosts(self, client, count_queries):
+        """Test that network exports load host ids only for the counts."""
+        network = Network(network="192.168.1.0", cidr=24)
+        network.hosts = [Host(ip_address="192.168.1.10", hostname="h1")]
+        db.session.add(network)
+        db.session.commit()
+
+        with count_queries() as statements:
+            response = client.get("/export/networks/json")
+            data = response.get_json()
+        assert data["data"][0]["statistics"]["used_hosts"] == 1
+        host_selects = [s for s in statements if "FROM hosts" in s]
+        assert host_selects
+        assert all("hosts.hostname" not in s for s in host_selects)
+
+    def test_export_hosts_csv_streamed(self, client):
+        """Test that CSV exports are streamed in coalesced blocks."""
+        # Long descriptions push the export past several blocks
+        description = "d" * 200
+        with client.application.app_context():
+            db.session.add_all(
+                Host(
+                    ip_address=f"10.0.{i // 256}.{i % 256}",
+                    description=description,
+                )
+                for i in range(1200)
+            )
+            db.session.commit()
+
+        response = client.get("/export/hosts/csv")
+        assert response.is_streamed
+        chunks = list(response.response)
+        assert len(chunks) > 1
+        assert all(len(chunk) >= BLOCK_SIZE for chunk in chunks[:-1])
+        assert b"".join(chunks).count(b"\n") == 1201
+
+    def test_export_hosts_csv_streamed_gzip(self, client):
+        """Test that streamed exports are gzip compressed on request."""
+        with client.application.app_context():
+            db.session.add_all(
+                Host(ip_address=f"10.0.{i // 256}.{i % 256}")
+                for i in range(1200)
+            )
+            db.session.commit()
+
+        response = client.get(
+            "/export/hosts/csv", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.is_streamed
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.data).count(b"\n") == 1201
+
     def test_export_hosts_json(self, client):
         """Test host JSON export route."""
         with client.application.app_context():
@@ -606,7 +770,7 @@ class TestExportRoutes:
             in response.headers["Content-Disposition"]
         )
 
-        json_data = json.loads(response.data)
+        json_data = response.get_json()
         assert json_data["export_type"] == "hosts"
         assert len(json_data["data"]) == 1
 
@@ -719,7 +883,7 @@ class TestImportRoutes:
         assert b"Import Data" in response.data
         assert b"CSV" in response.data
 
-    def test_import_networks_csv(self, client):
+    def test_import_networks_csv(self, client, flashes):
         """Test importing networks via CSV upload."""
         csv_data = b"""Network,CIDR,VLAN ID,Location,Description
 192.168.1.0,24,100,Office,Test network"""
@@ -730,9 +894,9 @@ class TestImportRoutes:
             "file": (BytesIO(csv_data), "networks.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 networks!" in flashes()
 
         # Verify network was created
         with client.application.app_context():
@@ -740,8 +904,10 @@ class TestImportRoutes:
             assert network is not None
             assert network.cidr == 24
             assert network.vlan_id == 100
+            assert network.updated_at is not None
+            assert Network.lookup_for_ip(3232235786) == network
 
-    def test_import_hosts_csv(self, client):
+    def test_import_hosts_csv(self, client, flashes):
         """Test importing hosts via CSV upload."""
         csv_data = b"""IP Address,Hostname,MAC Address,Status,Description
 192.168.1.10,server01,aa:bb:cc:dd:ee:ff,active,Web server"""
@@ -752,9 +918,9 @@ class TestImportRoutes:
             "file": (BytesIO(csv_data), "hosts.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 hosts!" in flashes()
 
         # Verify host was created
         with client.application.app_context():
@@ -762,7 +928,7 @@ class TestImportRoutes:
             assert host is not None
             assert host.hostname == "server01"
 
-    def test_import_networks_json(self, client):
+    def test_import_networks_json(self, client, flashes):
         """Test importing networks via JSON upload."""
         json_data = json.dumps(
             [
@@ -782,9 +948,9 @@ class TestImportRoutes:
             "file": (BytesIO(json_data), "networks.json"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 networks!" in flashes()
 
         # Verify network was created
         with client.application.app_context():
@@ -793,7 +959,7 @@ class TestImportRoutes:
             assert network.cidr == 24
             assert network.vlan_id == 100
 
-    def test_import_hosts_json(self, client):
+    def test_import_hosts_json(self, client, flashes):
         """Test importing hosts via JSON upload."""
         json_data = json.dumps(
             [
@@ -813,9 +979,9 @@ class TestImportRoutes:
             "file": (BytesIO(json_data), "hosts.json"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 hosts!" in flashes()
 
         # Verify host was created
         with client.application.app_context():
@@ -823,7 +989,7 @@ class TestImportRoutes:
             assert host is not None
             assert host.hostname == "server01"
 
-    def test_import_json_export_format(self, client):
+    def test_import_json_export_format(self, client, flashes):
         """Test importing from our JSON export format."""
         json_data = json.dumps(
             {
@@ -847,11 +1013,11 @@ class TestImportRoutes:
             "file": (BytesIO(json_data), "export.json"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 networks!" in flashes()
 
-    def test_import_with_errors(self, client):
+    def test_import_with_errors(self, client, flashes):
         """Test import with validation errors."""
         csv_data = b"""IP Address,Hostname,MAC Address,Status,Description
 invalid.ip,server01,,active,Invalid IP
@@ -863,10 +1029,13 @@ invalid.ip,server01,,active,Invalid IP
             "file": (BytesIO(csv_data), "hosts.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Import completed with 1 errors" in response.data
-        assert b"Successfully imported 1 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        messages = flashes()
+        assert any(
+            m.startswith("Import completed with 1 errors") for m in messages
+        )
+        assert "Successfully imported 1 hosts!" in messages
 
     def test_legacy_import_route(self, client):
         """Test legacy import route redirects correctly."""
@@ -874,6 +1043,36 @@ invalid.ip,server01,,active,Invalid IP
         assert response.status_code == 302
         assert "/import" in response.location
 
+    def test_network_index_unmatched_address(self):
+        """Addresses outside every network stop after a nesting-deep walk."""
+
+        class CountingList(list):
+            reads = 0
+
+            def __getitem__(self, i):
+                CountingList.reads += 1
+                return super().__getitem__(i)
+
+        # Every other /24, so each one is followed by a gap
+        rows = [
+            SimpleNamespace(
+                id=i, network=f"10.{i // 128}.{i % 128 * 2}.0", cidr=24
+            )
+            for i in range(5000)
+        ]
+        rows.append(SimpleNamespace(id=-1, network="10.0.0.0", cidr=16))
+        starts, ranges, parents = _build_network_index(rows)
+        index = (starts, CountingList(ranges), parents)
+
+        assert _detect_network_id("10.20.1.1", index) is None
+        assert _detect_network_id("10.200.0.1", index) is None
+        assert CountingList.reads == 2
+
+        # A gap inside the /16 falls back to the enclosing network
+        assert _detect_network_id("10.0.5.9", index) == -1
+        assert _detect_network_id("10.0.4.9", index) == 2
+        assert _detect_network_id("9.255.255.255", index) is None
+
 
 class TestEdgeCases:
     """Test edge cases and error handling scenarios."""
@@ -908,7 +1107,7 @@ class TestEdgeCases:
         response = client.post("/import", data=data, follow_redirects=True)
         assert response.status_code == 200
 
-    def test_duplicate_network_import(self, client):
+    def test_duplicate_network_import(self, client, flashes):
         """Test importing duplicate networks."""
         with client.application.app_context():
             existing_network = Network(network="192.168.1.0", cidr=24)
@@ -925,11 +1124,11 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "duplicates.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 networks!" in flashes()
 
-    def test_duplicate_host_import(self, client):
+    def test_duplicate_host_import(self, client, flashes):
         """Test importing duplicate hosts."""
         with client.application.app_context():
             existing_host = Host(ip_address="192.168.1.10", hostname="existing")
@@ -946,11 +1145,31 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "duplicates.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 1 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 hosts!" in flashes()
+
+    def test_duplicate_rows_within_import(self, client, flashes):
+        """Test that repeated rows in one file are imported once."""
+        csv_data = b"""IP Address,Hostname,MAC Address,Status,Description
+192.168.1.10,server01,aa:bb:cc:dd:ee:ff,active,First
+192.168.1.10,server01b,aa:bb:cc:dd:ee:ff,active,Repeated"""
+
+        data = {
+            "import_type": "hosts",
+            "format_type": "csv",
+            "file": (BytesIO(csv_data), "repeated.csv"),
+        }
 
-    def test_utf8_encoding_import(self, client):
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 1 hosts!" in flashes()
+
+        with client.application.app_context():
+            host = Host.query.filter_by(ip_address="192.168.1.10").one()
+            assert host.hostname == "server01"
+
+    def test_utf8_encoding_import(self, client, flashes):
         """Test importing data with UTF-8 special characters."""
         csv_data = """Network,CIDR,VLAN ID,Location,Description
 192.168.1.0,24,100,München,Netzwerk für Büro
@@ -962,16 +1181,16 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "utf8.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 2 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 2 networks!" in flashes()
 
         with client.application.app_context():
             network = Network.query.filter_by(location="München").first()
             assert network is not None
             assert "Netzwerk" in network.description
 
-    def test_large_cidr_values(self, client):
+    def test_large_cidr_values(self, client, flashes):
         """Test importing networks with edge case CIDR values."""
         csv_data = b"""Network,CIDR,VLAN ID,Location,Description
 10.0.0.0,8,100,Office,Large network
@@ -984,11 +1203,11 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "edge_cidrs.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 3 networks!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 3 networks!" in flashes()
 
-    def test_invalid_mac_address_format(self, client):
+    def test_invalid_mac_address_format(self, client, flashes):
         """Test importing hosts with various MAC address formats."""
         csv_data = b"""IP Address,Hostname,MAC Address,Status,Description
 192.168.1.10,server01,aa:bb:cc:dd:ee:ff,active,Valid MAC
@@ -1002,11 +1221,11 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "mac_formats.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 4 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 4 hosts!" in flashes()
 
-    def test_invalid_status_values(self, client):
+    def test_invalid_status_values(self, client, flashes):
         """Test importing hosts with invalid status values."""
         csv_data = b"""IP Address,Hostname,MAC Address,Status,Description
 192.168.1.10,server01,,unknown,Invalid status
@@ -1018,9 +1237,9 @@ class TestEdgeCases:
             "file": (BytesIO(csv_data), "invalid_status.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 2 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 2 hosts!" in flashes()
 
         # Verify status was normalized to 'active'
         with client.application.app_context():
@@ -1033,20 +1252,26 @@ class TestPerformance:
 
     def test_large_network_export(self, app_context):
         """Test exporting a large number of networks."""
-        # Create 100 networks
-        networks = []
+        # Create 100 networks without per-object unit-of-work overhead;
+        # Core inserts skip the model validator, so set the range columns
+        rows = []
         for i in range(100):
-            network = Network(
-                network=f"10.{i}.0.0",
-                cidr=16,
-                broadcast_address=f"10.{i}.255.255",
-                vlan_id=i + 100,
-                location=f"Location {i}",
-                description=f"Test network {i}",
+            start, end = network_bounds(f"10.{i}.0.0", 16)
+            rows.append(
+                {
+                    "network": f"10.{i}.0.0",
+                    "cidr": 16,
+                    "broadcast_address": f"10.{i}.255.255",
+                    "vlan_id": i + 100,
+                    "location": f"Location {i}",
+                    "description": f"Test network {i}",
+                    "network_start": start,
+                    "network_end": end,
+                }
             )
-            networks.append(network)
-            db.session.add(network)
+        db.session.execute(insert(Network), rows)
         db.session.commit()
+        networks = Network.query.options(selectinload(Network.hosts)).all()
 
         # Test CSV export performance
         exporter = CSVExporter()
@@ -1060,27 +1285,67 @@ class TestPerformance:
         json_content = json.loads(json_data.decode("utf-8"))
         assert len(json_content["data"]) == 100
 
-    def test_large_host_import(self, client):
+    def test_large_host_import(self, client, flashes):
         """Test importing a large number of hosts."""
         # Create CSV with 50 hosts
-        csv_lines = ["IP Address,Hostname,MAC Address,Status,Description"]
-        for i in range(50):
-            csv_lines.append(
+        csv_file = _csv_upload(
+            "IP Address,Hostname,MAC Address,Status,Description",
+            (
                 f"192.168.1.{i+10},host{i:02d},aa:bb:cc:dd:ee:{i:02x},active,Host {i}"
-            )
-        csv_data = "\n".join(csv_lines).encode("utf-8")
+                for i in range(50)
+            ),
+        )
 
         data = {
             "import_type": "hosts",
             "format_type": "csv",
-            "file": (BytesIO(csv_data), "large_hosts.csv"),
+            "file": (csv_file, "large_hosts.csv"),
         }
 
-        response = client.post("/import", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Successfully imported 50 hosts!" in response.data
+        response = client.post("/import", data=data)
+        assert response.status_code == 302
+        assert "Successfully imported 50 hosts!" in flashes()
 
         # Verify all hosts were imported
         with client.application.app_context():
             host_count = Host.query.count()
             assert host_count >= 50
+
+    def test_bulk_host_import(self, client, flashes):
+        """Test importing thousands of hosts in one request."""
+        csv_file = _csv_upload(
+            "IP Address,Hostname",
+            (f"10.{i // 256}.{i % 256}.1,host{i}" for i in range(5000)),
+        )
+        data = {
+            "import_type": "hosts",
+            "format_type": "csv",
+            "file": (csv_file, "hosts.csv"),
+        }
+
+        response = client.post("/import", data=data)
+        assert "Successfully imported 5000 hosts!" in flashes()
+
+        with client.application.app_context():
+            assert Host.query.count() == 5000
+
+    def test_large_host_import_single_insert(self, client, count_queries):
+        """Test that an import writes all hosts with one INSERT."""
+        csv_file = _csv_upload(
+            "IP Address,Hostname",
+            (f"192.168.1.{i+10},host{i:02d}" for i in range(50)),
+        )
+        data = {
+            "import_type": "hosts",
+            "format_type": "csv",
+            "file": (csv_file, "hosts.csv"),
+        }
+
+        with count_queries() as statements:
+            response = client.post("/import", data=data)
+        assert response.status_code == 302
+
+        inserts = [s for s in statements if s.startswith("INSERT")]
+        assert len(inserts) == 1
+        with client.application.app_context():
+            assert Host.query.count() == 50
@@ -3,6 +3,14 @@
 import os
 from pathlib import Path
 
+import pytest
+
+
+@pytest.fixture(scope="module")
+def env_content():
+    """Return migrations/env.py, read once for the module."""
+    return Path("migrations/env.py").read_text()
+
 
 class TestMigrationsStructure:
     """Tests for migrations directory structure."""
@@ -16,10 +24,8 @@ class TestMigrationsStructure:
         """Test that migrations/env.py exists."""
         assert os.path.exists("migrations/env.py")
 
-    def test_migrations_env_has_file_check(self):
+    def test_migrations_env_has_file_check(self, env_content):
         """Test that env.py checks for file existence before loading."""
-        env_content = Path("migrations/env.py").read_text()
-
         # Check that env.py has the file existence check
         assert (
             "os.path.exists" in env_content
@@ -51,15 +57,12 @@ class TestMigrationsStructure:
             len(migration_files) > 0
         ), "At least one migration file should exist"
 
-    def test_alembic_ini_not_required(self):
+    def test_alembic_ini_not_required(self, env_content):
         """Test that alembic.ini is not required (container-friendly)."""
         # alembic.ini should not exist in container deployments
         # env.py should work without it
         alembic_ini_path = "migrations/alembic.ini"
 
-        # Read env.py to verify it can handle missing alembic.ini
-        env_content = Path("migrations/env.py").read_text()
-
         # The file check should prevent FileNotFoundError
         if not os.path.exists(alembic_ini_path):
             assert (
@@ -3,9 +3,53 @@
 import ipaddress
 
 import pytest
+from sqlalchemy.orm import undefer
 
 from ipam.extensions import db
-from ipam.models import DhcpRange, Host, Network
+from ipam.models import (
+    DhcpRange,
+    Host,
+    Network,
+    ip_to_int,
+    network_bounds,
+    parse_network,
+)
+
+
+class TestAddressHelpers:
+    def test_ip_to_int(self):
+        assert ip_to_int("192.168.1.10") == int(
+            ipaddress.IPv4Address("192.168.1.10")
+        )
+
+    @pytest.mark.parametrize(
+        "address", ["10.1", "010.0.0.1", "256.0.0.1", "10.0.0.1 ", "", None]
+    )
+    def test_ip_to_int_rejects_invalid(self, address):
+        with pytest.raises(ValueError):
+            ip_to_int(address)
+
+    @pytest.mark.parametrize("cidr", [0, 8, 23, 31, 32])
+    def test_network_bounds_matches_ipaddress(self, cidr):
+        net = ipaddress.IPv4Network(f"10.20.30.40/{cidr}", strict=False)
+        assert network_bounds("10.20.30.40", cidr) == (
+            int(net.network_address),
+            int(net.broadcast_address),
+        )
+
+    @pytest.mark.parametrize(
+        "network,cidr", [("10.0.0.0", 33), ("10.0.0.0", -1), ("bad", 24)]
+    )
+    def test_network_bounds_invalid(self, network, cidr):
+        assert network_bounds(network, cidr) == (None, None)
+
+    def test_parse_network_shared_between_rows(self):
+        first = Network(network="10.20.30.0", cidr=24)
+        second = Network(network="10.20.30.0", cidr=24)
+        assert first.ip_network is second.ip_network
+        assert parse_network("10.20.30.40", 24) == ipaddress.IPv4Network(
+            "10.20.30.0/24"
+        )
 
 
 class TestNetworkModel:
@@ -38,7 +82,50 @@ class TestNetworkModel:
         assert network.used_hosts == 0
         assert network.available_hosts == 254
 
-    def test_network_with_hosts(self, app_context):
+    @pytest.mark.parametrize(
+        "cidr,expected",
+        [(8, 16777214), (24, 254), (30, 2), (31, 2), (32, 1)],
+    )
+    def test_network_total_hosts(self, app_context, cidr, expected):
+        network = Network(network="10.0.0.0", cidr=cidr)
+        assert network.total_hosts == expected
+
+    def test_network_range_columns(self, app_context):
+        network = Network(network="192.168.1.0", cidr=24)
+        assert network.network_start == int(
+            ipaddress.IPv4Address("192.168.1.0")
+        )
+        assert network.network_end == int(
+            ipaddress.IPv4Address("192.168.1.255")
+        )
+
+        network.cidr = 25
+        assert network.network_end == int(
+            ipaddress.IPv4Address("192.168.1.127")
+        )
+
+    def test_network_ip_network_cached(self, app_context):
+        network = Network(network="192.168.1.0", cidr=24)
+        assert network.ip_network is network.ip_network
+        assert network.ip_network.prefixlen == 24
+
+        network.cidr = 25
+        assert network.ip_network.prefixlen == 25
+
+    def test_network_lookup_for_ip(self, app_context):
+        wide = Network(network="10.0.0.0", cidr=8)
+        narrow = Network(network="10.1.0.0", cidr=16)
+        db.session.add_all([wide, narrow])
+        db.session.commit()
+
+        ip = int(ipaddress.IPv4Address("10.1.2.3"))
+        assert Network.lookup_for_ip(ip) == narrow
+        ip = int(ipaddress.IPv4Address("10.2.0.1"))
+        assert Network.lookup_for_ip(ip) == wide
+        ip = int(ipaddress.IPv4Address("192.168.0.1"))
+        assert Network.lookup_for_ip(ip) is None
+
+    def test_network_with_hosts(self, app_context, count_queries):
         network = Network(
             network="192.168.1.0", cidr=24, broadcast_address="192.168.1.255"
         )
@@ -51,12 +138,33 @@ class TestNetworkModel:
         host2 = Host(
             ip_address="192.168.1.11", hostname="test2", network_id=network.id
         )
-        db.session.add(host1)
-        db.session.add(host2)
+        db.session.add_all([host1, host2])
         db.session.commit()
 
-        assert network.used_hosts == 2
-        assert network.available_hosts == 252
+        with count_queries() as statements:
+            assert network.used_hosts == 2
+            assert network.available_hosts == 252
+        # available_hosts reuses the host_count that used_hosts loaded
+        (count_stmt,) = [s for s in statements if "FROM hosts" in s]
+        assert "count(hosts.id)" in count_stmt
+
+    def test_network_host_count_undeferred(self, app_context, count_queries):
+        network = Network(network="192.168.1.0", cidr=24)
+        network.hosts = [
+            Host(ip_address=f"192.168.1.{i}") for i in range(10, 13)
+        ]
+        db.session.add(network)
+        db.session.commit()
+        db.session.expunge_all()
+
+        with count_queries() as statements:
+            (loaded,) = Network.query.options(undefer(Network.host_count)).all()
+            assert loaded.used_hosts == 3
+            assert loaded.available_hosts == 251
+        # The count rides along in the one SELECT against networks
+        (select_stmt,) = [s for s in statements if s.startswith("SELECT")]
+        assert "count(hosts.id)" in select_stmt
+        assert "hosts" not in loaded.__dict__
 
     def test_network_unique_constraint(self, app_context):
         network1 = Network(network="192.168.1.0", cidr=24)
@@ -71,13 +179,10 @@ class TestNetworkModel:
 
     def test_network_cascade_delete(self, app_context):
         network = Network(network="192.168.1.0", cidr=24)
+        network.hosts = [Host(ip_address="192.168.1.10")]
         db.session.add(network)
         db.session.commit()
 
-        host = Host(ip_address="192.168.1.10", network_id=network.id)
-        db.session.add(host)
-        db.session.commit()
-
         network_id = network.id
         db.session.delete(network)
         db.session.commit()
@@ -123,11 +228,8 @@ class TestHostModel:
 
     def test_host_network_relationship(self, app_context):
         network = Network(network="192.168.1.0", cidr=24)
-        db.session.add(network)
-        db.session.commit()
-
-        host = Host(ip_address="192.168.1.10", network_id=network.id)
-        db.session.add(host)
+        host = Host(ip_address="192.168.1.10", network_ref=network)
+        db.session.add_all([network, host])
         db.session.commit()
 
         assert host.network_ref == network
@@ -156,19 +258,14 @@ class TestDhcpRangeModel:
 
     def test_dhcp_range_cascade_delete(self, app_context):
         network = Network(network="10.0.1.0", cidr=24)
-        db.session.add(network)
-        db.session.commit()
-
         dhcp_range = DhcpRange(
-            network_id=network.id,
-            start_ip="10.0.1.10",
-            end_ip="10.0.1.20",
+            network_ref=network, start_ip="10.0.1.10", end_ip="10.0.1.20"
         )
-        db.session.add(dhcp_range)
+        db.session.add_all([network, dhcp_range])
         db.session.commit()
 
         range_id = dhcp_range.id
         db.session.delete(network)
         db.session.commit()
 
-        assert DhcpRange.query.filter_by(id=range_id).first() is None
+        assert db.session.get(DhcpRange, range_id) is None
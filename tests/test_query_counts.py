@@ -0,0 +1,75 @@
+"""Guard list views against N+1 queries."""
+
+import pytest
+
+from ipam.extensions import db
+from ipam.models import Host, Network
+
+AUTH = {"Authorization": "Bearer test-token"}
+
+
+def _seed(first, count):
+    """Add count networks, each holding two hosts."""
+    for i in range(first, first + count):
+        network = Network(network=f"10.{i}.0.0", cidr=24)
+        network.hosts = [
+            Host(ip_address=f"10.{i}.0.{n}", hostname=f"h{i}-{n}")
+            for n in (1, 2)
+        ]
+        db.session.add(network)
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/",
+        "/networks",
+        "/hosts",
+        "/api/networks",
+        "/api/hosts",
+        "/api/v1/networks",
+        "/api/v1/hosts",
+    ],
+)
+def test_query_count_independent_of_rows(client, count_queries, url):
+    _seed(0, 1)
+    with count_queries() as few:
+        assert client.get(url, headers=AUTH).status_code == 200
+
+    _seed(1, 5)
+    with count_queries() as many:
+        assert client.get(url, headers=AUTH).status_code == 200
+
+    assert len(many) == len(few), many
+
+
+def _seed_hosts(networks, hosts_per_network):
+    """Add networks holding hosts_per_network hosts each."""
+    for i in range(networks):
+        network = Network(network=f"10.{i}.0.0", cidr=24)
+        network.hosts = [
+            Host(ip_address=f"10.{i}.0.{n}", hostname=f"h{i}-{n}")
+            for n in range(1, hosts_per_network + 1)
+        ]
+        db.session.add(network)
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        # Two ETag version probes plus the list SELECT, which carries the
+        # host_count subquery
+        ("/networks", 3),
+        # Two ETag version probes, the grouped host count and the list
+        ("/api/networks", 4),
+    ],
+)
+def test_network_list_query_ceiling(client, count_queries, url, expected):
+    _seed_hosts(5, 10)
+    with count_queries() as statements:
+        assert client.get(url, headers=AUTH).status_code == 200
+
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == expected, selects
@@ -1,5 +1,6 @@
 """Test web routes."""
 
+import gzip
 import json
 
 import pytest
@@ -14,20 +15,26 @@ class TestIndexRoute:
         assert response.status_code == 200
         assert b"IPAM Dashboard" in response.data
 
-    def test_index_with_data(self, client):
-        with client.application.app_context():
-            network = Network(network="192.168.1.0", cidr=24)
-            db.session.add(network)
-            db.session.commit()
-
-            host = Host(ip_address="192.168.1.10", network_id=network.id)
-            db.session.add(host)
-            db.session.commit()
+    def test_index_with_data(self, client, network_id):
+        db.session.add(Host(ip_address="192.168.1.10", network_id=network_id))
+        db.session.commit()
 
         response = client.get("/")
         assert response.status_code == 200
         assert b"192.168.1.0" in response.data
 
+    def test_index_not_modified(self, client):
+        etag = client.get("/").headers["ETag"]
+        response = client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_index_with_flash_is_not_cached(self, client):
+        with client.session_transaction() as sess:
+            sess["_flashes"] = [("success", "Done")]
+        response = client.get("/")
+        assert "ETag" not in response.headers
+        assert b"Done" in response.data
+
 
 class TestNetworkRoutes:
     def test_networks_page(self, client):
@@ -40,7 +47,7 @@ class TestNetworkRoutes:
         assert response.status_code == 200
         assert b"Add New Network" in response.data
 
-    def test_add_network_post_valid(self, client):
+    def test_add_network_post_valid(self, client, flashes):
         data = {
             "network": "192.168.1.0",
             "cidr": 24,
@@ -48,9 +55,9 @@ class TestNetworkRoutes:
             "description": "Test network",
             "location": "Test location",
         }
-        response = client.post("/add_network", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Network added successfully!" in response.data
+        response = client.post("/add_network", data=data)
+        assert response.status_code == 302
+        assert "Network added successfully!" in flashes()
 
         with client.application.app_context():
             network = Network.query.filter_by(network="192.168.1.0").first()
@@ -64,12 +71,7 @@ class TestNetworkRoutes:
         assert response.status_code == 200
         assert b"Invalid network" in response.data
 
-    def test_add_network_duplicate(self, client):
-        with client.application.app_context():
-            network = Network(network="192.168.1.0", cidr=24)
-            db.session.add(network)
-            db.session.commit()
-
+    def test_add_network_duplicate(self, client, network_id):
         data = {"network": "192.168.1.0", "cidr": 24}
         response = client.post("/add_network", data=data)
         assert response.status_code == 200
@@ -81,12 +83,21 @@ class TestHostRoutes:
         assert response.status_code == 200
         assert b"Hosts" in response.data
 
+    def test_hosts_page_cache_follows_data(self, client):
+        assert b"cached-host" not in client.get("/hosts").data
+
+        with client.application.app_context():
+            db.session.add(Host(ip_address="10.0.0.5", hostname="cached-host"))
+            db.session.commit()
+
+        assert b"cached-host" in client.get("/hosts").data
+
     def test_add_host_get(self, client):
         response = client.get("/add_host")
         assert response.status_code == 200
         assert b"Add New Host" in response.data
 
-    def test_add_host_post_valid(self, client):
+    def test_add_host_post_valid(self, client, flashes):
         data = {
             "ip_address": "192.168.1.10",
             "hostname": "test-host",
@@ -95,9 +106,9 @@ class TestHostRoutes:
             "status": "active",
             "network_id": 0,
         }
-        response = client.post("/add_host", data=data, follow_redirects=True)
-        assert response.status_code == 200
-        assert b"Host added successfully!" in response.data
+        response = client.post("/add_host", data=data)
+        assert response.status_code == 302
+        assert "Host added successfully!" in flashes()
 
         with client.application.app_context():
             host = Host.query.filter_by(ip_address="192.168.1.10").first()
@@ -105,46 +116,67 @@ class TestHostRoutes:
             assert host.hostname == "test-host"
             assert host.status == "active"
 
-    def test_add_host_with_network(self, client):
-        with client.application.app_context():
-            network = Network(network="192.168.1.0", cidr=24)
-            db.session.add(network)
-            db.session.commit()
-            network_id = network.id
-
+    def test_add_host_with_network(self, client, network_id):
         data = {
             "ip_address": "192.168.1.10",
             "hostname": "test-host",
             "status": "active",
             "network_id": network_id,
         }
-        response = client.post("/add_host", data=data, follow_redirects=True)
-        assert response.status_code == 200
+        response = client.post("/add_host", data=data)
+        assert response.status_code == 302
 
         with client.application.app_context():
             host = Host.query.filter_by(ip_address="192.168.1.10").first()
             assert host.network_id == network_id
 
-    def test_add_host_auto_detect_network(self, client):
-        with client.application.app_context():
-            network = Network(network="192.168.1.0", cidr=24)
-            db.session.add(network)
-            db.session.commit()
-            network_id = network.id
-
+    def test_add_host_auto_detect_network(self, client, network_id):
         data = {
             "ip_address": "192.168.1.10",
             "hostname": "test-host",
             "status": "active",
             "network_id": 0,
         }
-        response = client.post("/add_host", data=data, follow_redirects=True)
-        assert response.status_code == 200
+        response = client.post("/add_host", data=data)
+        assert response.status_code == 302
 
         with client.application.app_context():
             host = Host.query.filter_by(ip_address="192.168.1.10").first()
             assert host.network_id == network_id
 
+    def test_add_host_network_queries(self, client, count_queries, network_id):
+        data = {"ip_address": "192.168.1.10", "status": "active"}
+        with count_queries() as statements:
+            client.post("/add_host", data={**data, "network_id": 0})
+        choices, detect = [
+            s for s in statements if s.lstrip().startswith("SELECT networks.")
+        ]
+        # Only the columns needed for the dropdown
+        assert "networks.description" not in choices
+        # Auto-detection is a range probe instead of a scan of all networks
+        assert "networks.network_start <=" in detect
+
+    def test_add_host_auto_detect_most_specific_network(self, client):
+        with client.application.app_context():
+            networks = [
+                Network(network="10.0.0.0", cidr=8),
+                Network(network="10.1.0.0", cidr=24),
+                Network(network="10.1.2.0", cidr=24),
+            ]
+            db.session.add_all(networks)
+            db.session.commit()
+            wide_id, _, narrow_id = [n.id for n in networks]
+
+        for ip in ("10.1.2.10", "10.1.3.10"):
+            data = {"ip_address": ip, "status": "active", "network_id": 0}
+            client.post("/add_host", data=data)
+
+        with client.application.app_context():
+            host = Host.query.filter_by(ip_address="10.1.2.10").first()
+            assert host.network_id == narrow_id
+            host = Host.query.filter_by(ip_address="10.1.3.10").first()
+            assert host.network_id == wide_id
+
     def test_add_host_invalid_ip(self, client):
         data = {"ip_address": "invalid-ip", "status": "active", "network_id": 0}
         response = client.post("/add_host", data=data)
@@ -166,12 +198,21 @@ class TestAPIRoutes:
         response = client.get("/api/networks")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) == 1
         assert data[0]["network"] == "192.168.1.0"
         assert data[0]["cidr"] == 24
         assert data[0]["vlan_id"] == 100
 
+    def test_api_networks_host_counts(self, client, network_id):
+        db.session.add(Host(ip_address="192.168.1.10", network_id=network_id))
+        db.session.commit()
+
+        data = client.get("/api/networks").get_json()
+        assert data[0]["total_hosts"] == 254
+        assert data[0]["used_hosts"] == 1
+        assert data[0]["available_hosts"] == 253
+
     def test_api_hosts(self, client):
         with client.application.app_context():
             host = Host(
@@ -183,19 +224,49 @@ class TestAPIRoutes:
         response = client.get("/api/hosts")
         assert response.status_code == 200
 
-        data = json.loads(response.data)
+        data = response.get_json()
         assert len(data) == 1
         assert data[0]["ip_address"] == "192.168.1.10"
         assert data[0]["hostname"] == "test-host"
         assert data[0]["status"] == "active"
 
+    def test_api_hosts_conditional(self, client):
+        etag = client.get("/api/hosts").headers["ETag"]
+        response = client.get("/api/hosts", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        with client.application.app_context():
+            db.session.add(Host(ip_address="192.168.1.10"))
+            db.session.commit()
+
+        response = client.get("/api/hosts", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert len(response.get_json()) == 1
+
+    def test_api_hosts_gzip(self, client):
+        with client.application.app_context():
+            db.session.add_all(
+                Host(ip_address=f"192.168.1.{i}", hostname=f"host{i}")
+                for i in range(1, 50)
+            )
+            db.session.commit()
+
+        headers = {"Accept-Encoding": "gzip"}
+        response = client.get("/api/hosts", headers=headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(json.loads(gzip.decompress(response.data))) == 49
+
+        headers["If-None-Match"] = response.headers["ETag"]
+        response = client.get("/api/hosts", headers=headers)
+        assert response.status_code == 304
+
     def test_api_empty_response(self, client):
         response = client.get("/api/networks")
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data == []
 
         response = client.get("/api/hosts")
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data == []
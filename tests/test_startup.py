@@ -2,6 +2,8 @@
 
 from unittest import mock
 
+import pytest
+
 from ipam import startup
 
 
@@ -34,20 +36,16 @@ def test_should_run_migrations_default_true():
     assert startup.should_run_migrations({})
 
 
-def test_should_run_migrations_explicit_true():
+@pytest.mark.parametrize("value", ["true", "TRUE", "1", "yes", "on"])
+def test_should_run_migrations_explicit_true(value):
     """Test various truthy values."""
-    for value in ["true", "TRUE", "1", "yes", "on"]:
-        assert startup.should_run_migrations(
-            {"IPAM_RUN_MIGRATIONS": value}
-        ), f"Failed for value: {value}"
+    assert startup.should_run_migrations({"IPAM_RUN_MIGRATIONS": value})
 
 
-def test_should_run_migrations_explicit_false():
+@pytest.mark.parametrize("value", ["false", "FALSE", "0", "no", "off"])
+def test_should_run_migrations_explicit_false(value):
     """Test various falsy values."""
-    for value in ["false", "FALSE", "0", "no", "off"]:
-        assert not startup.should_run_migrations(
-            {"IPAM_RUN_MIGRATIONS": value}
-        ), f"Failed for value: {value}"
+    assert not startup.should_run_migrations({"IPAM_RUN_MIGRATIONS": value})
 
 
 def test_should_run_migrations_whitespace():